@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Escrita atômica de arquivos: temporário no mesmo diretório + fsync + rename
+Uma queda no meio da escrita nunca deixa o arquivo truncado
+"""
+
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+
+from profiling import span
+
+CHUNK_SIZE = 1024 * 1024
+
+# mkstemp cria com 0600; arquivos novos devem seguir a umask, como open() faria
+_umask = None
+
+
+def _current_umask():
+    """
+    Umask do processo, lida uma vez no primeiro arquivo novo. No Linux vem de /proc,
+    sem alterá-la; os.umask(0) deixaria uma janela em que outra thread cria arquivos com 0666
+    """
+    global _umask
+    if _umask is None:
+        try:
+            with open("/proc/self/status", 'r') as f:
+                _umask = next(int(line.split()[1], 8) for line in f if line.startswith("Umask:"))
+        except (OSError, StopIteration, ValueError, IndexError):
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+    return _umask
+
+
+def encode_text(content, encoding='utf-8', newline=None):
+    """Converte texto em bytes como open(..., 'w') faria (newline=None usa os.linesep)"""
+    if newline is None:
+        newline = os.linesep
+    if newline != "\n":
+        content = content.replace("\n", newline)
+    return content.encode(encoding)
+
+
+def same_content(path, data):
+    """Compara tamanho e depois hash do arquivo com os bytes dados (sem ler se o tamanho difere)"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+    except FileNotFoundError:
+        return False
+    digest = hashlib.sha256()
+    with span("hash", path) as s, open(path, 'rb') as f:
+        size = 0
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+        s.nbytes = size
+    return digest.digest() == hashlib.sha256(data).digest()
+
+
+def _fsync_dir(directory):
+    """Garante que o rename chegou ao disco (não suportado no Windows)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data, durable=True):
+    """Grava num temporário, faz fsync e renomeia por cima do destino"""
+    path = Path(path)
+    with span("write", path, len(data)):
+        return _atomic_write(path, data, durable)
+
+
+def _atomic_write(path, data, durable):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        mode = path.stat().st_mode & 0o7777 if path.exists() else 0o666 & ~_current_umask()
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    if durable:
+        _fsync_dir(path.parent)
+    return path
+
+
+def write_if_changed(path, content, before_replace=None, encoding='utf-8', newline=None, durable=True):
+    """
+    Escreve o conteúdo só se ele for diferente do que já está no disco.
+    before_replace(path) roda antes de sobrescrever um arquivo existente (ex.: backup).
+    Retorna True se gravou, False se o arquivo já estava idêntico
+    """
+    data = content if isinstance(content, bytes) else encode_text(content, encoding, newline)
+    if same_content(path, data):
+        return False
+    if before_replace and Path(path).exists():
+        before_replace(path)
+    atomic_write_bytes(path, data, durable)
+    return True
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Script de execução automática para verificar e recriar GlobalHeader.tsx
+Script de execução automática para verificar e reparar GlobalHeader.tsx
+(--recreate volta a recriar o arquivo inteiro quando algo falha)
 """
 
 import os
@@ -12,12 +13,21 @@ sys.path.append(str(Path(__file__).parent))
 
 try:
     from file_manager import DesenrolaFileManager
+    from matcher import compile_matcher
+    from profiling import profile_flags
     
     print("🚀 Desenrola DCL - Execução Automática")
     print("=" * 50)
     
     # Inicializar o gerenciador
-    manager = DesenrolaFileManager()
+    profile, cprofile = profile_flags(sys.argv)
+    manager = DesenrolaFileManager(profile=profile, cprofile=cprofile)
+    
+    # Modo observação: verifica e faz backup só do que mudar em src/ (não roda a checagem única)
+    if "--watch" in sys.argv:
+        from watcher import watch
+        watch(manager.project_root, polling="--poll" in sys.argv)
+        sys.exit(0)
     
     # Verificar arquivo atual
     file_path = manager.project_root / "components" / "layout" / "GlobalHeader.tsx"
@@ -33,10 +43,14 @@ try:
         if is_valid:
             print("\n🎉 GlobalHeader.tsx está perfeito!")
             print("✅ Todas as verificações passaram")
-        else:
+        elif "--recreate" in sys.argv:
             print("\n⚠️  Problemas detectados. Recriando arquivo...")
             new_path = manager.create_global_header()
             print(f"✅ Arquivo recriado: {new_path}")
+        else:
+            # Só os trechos com problema voltam ao template; edições locais legítimas ficam
+            print("\n⚠️  Problemas detectados. Reparando os trechos afetados...")
+            manager.repair_global_header()
             
     else:
         print("❌ Arquivo não encontrado. Criando...")
@@ -48,10 +62,11 @@ try:
     if file_path.exists():
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
+        found = compile_matcher(['const ', 'import ']).counts(content)
         print(f"   📄 Linhas: {len(content.splitlines())}")
         print(f"   💾 Tamanho: {len(content)} caracteres")
-        print(f"   🎯 Componentes: {content.count('const ')}")
-        print(f"   📦 Imports: {content.count('import ')}")
+        print(f"   🎯 Componentes: {found['const ']}")
+        print(f"   📦 Imports: {found['import ']}")
     
     print("\n🏁 Execução concluída com sucesso!")
     
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Catálogo SQLite dos backups (backups/catalog.sqlite)
+Atualizado a cada backup_file; consultas indexadas por origem, período e tamanho
+"""
+
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    label TEXT,
+    tier INTEGER NOT NULL DEFAULT 0,
+    bucket TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_backups_source_time ON backups (source, created_at);
+CREATE INDEX IF NOT EXISTS idx_backups_time ON backups (created_at);
+CREATE INDEX IF NOT EXISTS idx_backups_size ON backups (size);
+CREATE INDEX IF NOT EXISTS idx_backups_sha256 ON backups (sha256);
+
+-- Blobs referenciados (por backups e por deltas que os usam como base)
+-- e total ocupado em disco
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL,
+    base TEXT,
+    method TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+
+-- Snapshots de pastas inteiras: cada blob distinto soma uma referência por snapshot
+CREATE TABLE IF NOT EXISTS snapshots (
+    id TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    label TEXT,
+    files INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_blobs (
+    snapshot TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, sha256)
+) WITHOUT ROWID;
+
+-- Origens com backups novos desde a última coleta de lixo
+CREATE TABLE IF NOT EXISTS gc_dirty (
+    source TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+# Índices que dependem das colunas de retenção (criados depois da migração)
+RETENTION_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_backups_tier_time ON backups (tier, created_at);
+CREATE INDEX IF NOT EXISTS idx_backups_source_bucket ON backups (source, bucket);
+"""
+
+INSERT_BACKUP = "INSERT INTO backups (source, sha256, size, created_at, label) VALUES (?, ?, ?, ?, ?)"
+
+ORDERINGS = {
+    "recent": ("created_at DESC, id DESC", "created_at"),
+    "oldest": ("created_at ASC, id ASC", "created_at"),
+    "largest": ("size DESC, id DESC", "size"),
+}
+
+
+def to_epoch(value):
+    """Aceita datetime, texto ISO ou número e devolve segundos desde a época"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class BackupCatalog:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.executescript(RETENTION_INDEXES)
+
+    def _migrate(self):
+        """Catálogos de versões anteriores: adiciona colunas e recalcula os blobs"""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(backups)")}
+        blob_columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(blobs)")}
+        if "method" not in blob_columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE blobs ADD COLUMN method TEXT")
+        if "tier" in columns and "base" in blob_columns:
+            return
+        with self.conn:
+            if "tier" not in columns:
+                self.conn.execute("ALTER TABLE backups ADD COLUMN tier INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("ALTER TABLE backups ADD COLUMN bucket TEXT")
+            if "base" not in blob_columns:
+                self.conn.execute("ALTER TABLE blobs ADD COLUMN base TEXT")
+            self._recount_blobs()
+
+    def close(self):
+        self.conn.close()
+
+    def _recount_blobs(self, blob_info=None):
+        """
+        Recalcula referências e bytes. blob_info(sha256) -> (bytes_em_disco, base)
+        vem do BackupStore; sem ele, assume blobs integrais do tamanho original
+        """
+        blobs = {row[0]: [row[1], row[2], None] for row in self.conn.execute(
+            "SELECT sha256, MAX(size), COUNT(*) FROM "
+            "(SELECT sha256, size FROM backups UNION ALL SELECT sha256, size FROM snapshot_blobs) GROUP BY sha256")}
+        if blob_info:
+            pending = list(blobs)
+            while pending:
+                sha256 = pending.pop()
+                stored_size, base = blob_info(sha256)
+                blobs[sha256][0], blobs[sha256][2] = stored_size, base
+                if base:
+                    if base not in blobs:
+                        blobs[base] = [0, 0, None]
+                        pending.append(base)
+                    blobs[base][1] += 1
+
+        methods = dict(self.conn.execute("SELECT sha256, method FROM blobs WHERE method IS NOT NULL"))
+        self.conn.execute("DELETE FROM blobs")
+        self.conn.executemany("INSERT INTO blobs (sha256, size, refs, base, method) VALUES (?, ?, ?, ?, ?)",
+                              ((sha256, *info, methods.get(sha256)) for sha256, info in blobs.items()))
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) "
+                          "SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM blobs")
+        self.conn.execute("INSERT OR IGNORE INTO gc_dirty (source) SELECT DISTINCT source FROM backups")
+
+    def _add_bytes(self, delta):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES ('total_bytes', ?) "
+                          "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value", (delta,))
+
+    def add_ref(self, sha256, size, base=None, method=None):
+        """
+        Soma uma referência ao blob (registrando-o se for novo; um delta referencia a base).
+        method: como o blob foi gravado (reflink, copy_file_range, sendfile, copy, zlib, lzma)
+        """
+        updated = self.conn.execute("UPDATE blobs SET refs = refs + 1 WHERE sha256 = ?", (sha256,)).rowcount
+        if not updated:
+            self.conn.execute("INSERT INTO blobs (sha256, size, refs, base, method) VALUES (?, ?, 1, ?, ?)",
+                              (sha256, size, base, method))
+            self._add_bytes(size)
+            if base:
+                self.conn.execute("UPDATE blobs SET refs = refs + 1 WHERE sha256 = ?", (base,))
+
+    def drop_ref(self, sha256):
+        """
+        Remove uma referência. Devolve [(sha256, bytes)] dos blobs que ficaram órfãos,
+        incluindo bases de delta que só eram usadas por ele
+        """
+        orphans = []
+        while sha256:
+            row = self.conn.execute("SELECT size, refs, base FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None:
+                break
+            if row["refs"] > 1:
+                self.conn.execute("UPDATE blobs SET refs = refs - 1 WHERE sha256 = ?", (sha256,))
+                break
+            self.conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+            self._add_bytes(-row["size"])
+            orphans.append((sha256, row["size"]))
+            sha256 = row["base"]
+        return orphans
+
+    def total_bytes(self):
+        """Bytes ocupados pelos blobs referenciados"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()
+        return row[0] if row else 0
+
+    def record(self, entry, stored_size=None, base=None, method=None):
+        """Registra uma entrada de histórico do BackupStore"""
+        with self.conn:
+            cursor = self.conn.execute(INSERT_BACKUP, (
+                entry["source"], entry["sha256"], entry["size"], to_epoch(entry["timestamp"]), entry.get("label")))
+            self.add_ref(entry["sha256"], entry["size"] if stored_size is None else stored_size, base, method)
+            self.conn.execute("INSERT OR IGNORE INTO gc_dirty (source) VALUES (?)", (entry["source"],))
+        return cursor.lastrowid
+
+    def remove(self, row_id):
+        """Apaga uma entrada; devolve (origem, sha256, [(blob_órfão, bytes)])"""
+        row = self.conn.execute("SELECT source, sha256 FROM backups WHERE id = ?", (row_id,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("DELETE FROM backups WHERE id = ?", (row_id,))
+        return row["source"], row["sha256"], self.drop_ref(row["sha256"])
+
+    def entries_for(self, source):
+        """Entradas de uma origem no formato do histórico JSONL (mais antiga primeiro)"""
+        rows = self.conn.execute(
+            "SELECT backups.*, blobs.method FROM backups LEFT JOIN blobs USING (sha256) "
+            "WHERE source = ? ORDER BY created_at, id", (source,))
+        entries = []
+        for row in rows:
+            entry = {
+                "source": row["source"],
+                "sha256": row["sha256"],
+                "size": row["size"],
+                "timestamp": datetime.fromtimestamp(row["created_at"]).isoformat(timespec='seconds'),
+            }
+            if row["label"]:
+                entry["label"] = row["label"]
+            if row["method"]:
+                entry["method"] = row["method"]   # sem ele o rebuild perde o método do blob
+            entries.append(entry)
+        return entries
+
+    def rebuild(self, entries, blob_info=None, snapshots=()):
+        """
+        Recria o catálogo a partir dos históricos (ex.: BackupStore.iter_entries())
+        e dos snapshots (BackupStore.iter_snapshots())
+        """
+        entries = list(entries)
+        rows = ((e["source"], e["sha256"], e["size"], to_epoch(e["timestamp"]), e.get("label")) for e in entries)
+        with self.conn:
+            self.conn.execute("DELETE FROM backups")
+            self.conn.executemany(INSERT_BACKUP, rows)
+            self.conn.execute("DELETE FROM snapshots")
+            self.conn.execute("DELETE FROM snapshot_blobs")
+            for snapshot in snapshots:
+                self._insert_snapshot(snapshot)
+            self._recount_blobs(blob_info)
+            self.conn.executemany("UPDATE blobs SET method = ? WHERE sha256 = ?",
+                                  ((e["method"], e["sha256"]) for e in entries if e.get("method")))
+
+    def _insert_snapshot(self, snapshot):
+        blobs = {sha256: size for sha256, size in snapshot["files"].values()}
+        self.conn.execute("INSERT INTO snapshots (id, root, created_at, label, files, size) VALUES (?, ?, ?, ?, ?, ?)",
+                          (snapshot["id"], snapshot["root"], to_epoch(snapshot["timestamp"]), snapshot.get("label"),
+                           len(snapshot["files"]), sum(size for _, size in snapshot["files"].values())))
+        self.conn.executemany("INSERT INTO snapshot_blobs (snapshot, sha256, size) VALUES (?, ?, ?)",
+                              ((snapshot["id"], sha256, size) for sha256, size in blobs.items()))
+        return blobs
+
+    def add_snapshot(self, snapshot, stored=None):
+        """
+        Registra um snapshot (formato de snapshots/*.json) com uma referência por blob distinto.
+        stored: {sha256: (bytes_em_disco, base, método)} dos blobs gravados agora
+        """
+        stored = stored or {}
+        with self.conn:
+            for sha256, size in self._insert_snapshot(snapshot).items():
+                stored_size, base, method = stored.get(sha256, (size, None, None))
+                self.add_ref(sha256, stored_size, base, method)
+
+    def remove_snapshot(self, snapshot_id):
+        """Apaga um snapshot; devolve [(blob_órfão, bytes)]"""
+        orphans = []
+        with self.conn:
+            rows = self.conn.execute("SELECT sha256 FROM snapshot_blobs WHERE snapshot = ?", (snapshot_id,)).fetchall()
+            self.conn.execute("DELETE FROM snapshot_blobs WHERE snapshot = ?", (snapshot_id,))
+            self.conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+            for row in rows:
+                orphans.extend(self.drop_ref(row["sha256"]))
+        return orphans
+
+    def snapshots(self, root=None):
+        """Snapshots registrados (mais recente primeiro)"""
+        clause, params = ("WHERE root = ?", (root,)) if root else ("", ())
+        return [dict(row) for row in self.conn.execute(
+            f"SELECT * FROM snapshots {clause} ORDER BY created_at DESC, id DESC", params)]
+
+    def known_blobs(self):
+        """Hashes de todos os blobs referenciados"""
+        return {row[0] for row in self.conn.execute("SELECT sha256 FROM blobs")}
+
+    def space_report(self):
+        """
+        Bytes no formato antigo (cópia integral por backup), só com deduplicação
+        e realmente ocupados (deduplicado + comprimido/delta)
+        """
+        legacy, backups = self.conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM backups").fetchone()
+        dedup = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM backups GROUP BY sha256)").fetchone()[0]
+        stored = self.total_bytes()
+        methods = dict(self.conn.execute(
+            "SELECT method, COUNT(*) FROM blobs WHERE method IS NOT NULL GROUP BY method ORDER BY 2 DESC"))
+        return {
+            "backups": backups,
+            "legacy_bytes": legacy,
+            "dedup_bytes": dedup,
+            "stored_bytes": stored,
+            "saved_ratio": 1 - stored / legacy if legacy else 0.0,
+            "methods": methods,
+        }
+
+    def _where(self, source, since, until, min_size, max_size):
+        clauses, params = [], []
+        for clause, value in (("source = ?", source), ("created_at >= ?", to_epoch(since)),
+                              ("created_at < ?", to_epoch(until)), ("size >= ?", min_size),
+                              ("size <= ?", max_size)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+
+    def query(self, source=None, since=None, until=None, min_size=None, max_size=None,
+              order="recent", limit=50, after=None):
+        """
+        Consulta paginada. `after` é o cursor devolvido pela página anterior
+        (paginação por chave: cada página custa o mesmo, seja a 1ª ou a 1000ª)
+        """
+        order_by, key = ORDERINGS[order]
+        clauses, params = self._where(source, since, until, min_size, max_size)
+        if after is not None:
+            op = ">" if order == "oldest" else "<"
+            clauses.append(f"({key}, id) {op} (?, ?)")
+            params.extend(after)
+
+        sql = "SELECT * FROM backups"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} LIMIT ?"
+        rows = [dict(row) for row in self.conn.execute(sql, params + [limit])]
+
+        cursor = (rows[-1][key], rows[-1]["id"]) if len(rows) == limit else None
+        return rows, cursor
+
+    def count(self, source=None, since=None, until=None, min_size=None, max_size=None):
+        """Quantidade de backups que atendem ao filtro"""
+        clauses, params = self._where(source, since, until, min_size, max_size)
+        sql = "SELECT COUNT(*) FROM backups"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def top(self, n=10, order="largest", **filters):
+        """Os N primeiros backups na ordem pedida"""
+        return self.query(order=order, limit=n, **filters)[0]
+
+    def sources(self):
+        """Arquivos de origem com quantidade de backups"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT source, COUNT(*) AS backups, MAX(created_at) AS last_backup FROM backups GROUP BY source ORDER BY source")]
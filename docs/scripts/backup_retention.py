@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Política de retenção e coleta de lixo do diretório de backups
+Mantém os N últimos backups por arquivo, afina os antigos para diário/semanal/mensal
+e respeita um orçamento total de bytes, removendo os mais antigos primeiro
+"""
+
+import json
+from datetime import datetime
+
+from backup_store import BackupStore
+
+DEFAULT_POLICY = {
+    "keep_last": 10,          # backups recentes mantidos integralmente por arquivo
+    "daily_days": 7,          # depois disso, um por dia durante N dias
+    "weekly_weeks": 4,        # depois, um por semana durante N semanas
+    "monthly_months": 12,     # depois, um por mês durante N meses
+    "max_total_bytes": None,  # orçamento total (None = sem limite)
+}
+
+TIER_RECENT, TIER_DAILY, TIER_WEEKLY, TIER_MONTHLY = 0, 1, 2, 3
+DAY = 86400
+BUDGET_BATCH = 256
+
+
+def load_policy(backup_dir):
+    """Política padrão sobrescrita por backups/retention.json, se existir"""
+    policy = dict(DEFAULT_POLICY)
+    policy_path = backup_dir / "retention.json"
+    if policy_path.exists():
+        with open(policy_path, 'r', encoding='utf-8') as f:
+            policy.update(json.load(f))
+    return policy
+
+
+def bucket_for(tier, created_at):
+    """Balde de afinamento: um backup por dia, semana ISO ou mês"""
+    moment = datetime.fromtimestamp(created_at)
+    if tier == TIER_DAILY:
+        return moment.strftime("d:%Y-%m-%d")
+    if tier == TIER_WEEKLY:
+        year, week, _ = moment.isocalendar()
+        return f"w:{year}-W{week:02d}"
+    return moment.strftime("m:%Y-%m")
+
+
+class GarbageCollector:
+    def __init__(self, store, policy=None, now=None, dry_run=False):
+        self.store = store
+        self.catalog = store.catalog
+        self.conn = self.catalog.conn
+        self.policy = policy or load_policy(store.backup_dir)
+        self.now = now if now is not None else datetime.now().timestamp()
+        self.dry_run = dry_run
+
+        # Limite de idade de cada camada (abaixo do limite o backup desce de camada)
+        self.cutoffs = {
+            TIER_DAILY: self.now - self.policy["daily_days"] * DAY,
+            TIER_WEEKLY: self.now - (self.policy["daily_days"] + self.policy["weekly_weeks"] * 7) * DAY,
+            TIER_MONTHLY: self.now - (self.policy["daily_days"] + self.policy["weekly_weeks"] * 7
+                                      + self.policy["monthly_months"] * 30) * DAY,
+        }
+        self.report = {"removed": 0, "promoted": 0, "blobs_deleted": 0, "bytes_freed": 0}
+        self._orphans = []
+        self._touched = set()
+
+    def _tier_for(self, created_at):
+        """Camada de destino de um backup fora da janela recente (None = expirado)"""
+        for tier in (TIER_DAILY, TIER_WEEKLY, TIER_MONTHLY):
+            if created_at >= self.cutoffs[tier]:
+                return tier
+        return None
+
+    def _remove(self, row_id):
+        source, _, orphans = self.catalog.remove(row_id)
+        self.report["removed"] += 1
+        self._touched.add(source)
+        for sha256, freed in orphans:
+            self._orphans.append(sha256)
+            self.report["blobs_deleted"] += 1
+            self.report["bytes_freed"] += freed
+
+    def _place(self, row_id, source, created_at):
+        """Move o backup para a camada da sua idade, mantendo só o mais novo por balde"""
+        tier = self._tier_for(created_at)
+        if tier is None:
+            self._remove(row_id)
+            return
+
+        bucket = bucket_for(tier, created_at)
+        occupant = self.conn.execute(
+            "SELECT id, created_at FROM backups WHERE source = ? AND bucket = ? AND id != ?",
+            (source, bucket, row_id)).fetchone()
+        if occupant is not None:
+            if occupant["created_at"] >= created_at:
+                self._remove(row_id)
+                return
+            self._remove(occupant["id"])
+
+        self.conn.execute("UPDATE backups SET tier = ?, bucket = ? WHERE id = ?", (tier, bucket, row_id))
+        self.report["promoted"] += 1
+
+    def _age_out_recent(self):
+        """Origens com backups novos: o que passou dos N últimos sai da camada recente"""
+        sources = [row["source"] for row in self.conn.execute("SELECT source FROM gc_dirty")]
+        for source in sources:
+            rows = self.conn.execute(
+                "SELECT id, created_at FROM backups WHERE source = ? AND tier = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?",
+                (source, TIER_RECENT, self.policy["keep_last"])).fetchall()
+            for row in reversed(rows):
+                self._place(row["id"], source, row["created_at"])
+        self.conn.execute("DELETE FROM gc_dirty")
+
+    def _age_out(self, tier):
+        """Backups que ficaram velhos demais para a camada (usa o índice tier, created_at)"""
+        rows = self.conn.execute(
+            "SELECT id, source, created_at FROM backups WHERE tier = ? AND created_at < ? ORDER BY created_at",
+            (tier, self.cutoffs[tier])).fetchall()
+        for row in rows:
+            if self.conn.execute("SELECT 1 FROM backups WHERE id = ?", (row["id"],)).fetchone():
+                self._place(row["id"], row["source"], row["created_at"])
+
+    def _is_latest(self, source, row_id):
+        latest = self.conn.execute(
+            "SELECT id FROM backups WHERE source = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            (source,)).fetchone()
+        return latest is not None and latest["id"] == row_id
+
+    def _enforce_budget(self):
+        """Remove os backups mais antigos até caber no orçamento (o último de cada arquivo fica)"""
+        budget = self.policy["max_total_bytes"]
+        if budget is None:
+            return
+        after = (float("-inf"), 0)
+        while self.catalog.total_bytes() > budget:
+            rows = self.conn.execute(
+                "SELECT id, source, created_at FROM backups WHERE (created_at, id) > (?, ?) "
+                "ORDER BY created_at, id LIMIT ?", (*after, BUDGET_BATCH)).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                after = (row["created_at"], row["id"])
+                if self.catalog.total_bytes() <= budget:
+                    break
+                if not self._is_latest(row["source"], row["id"]):
+                    self._remove(row["id"])
+
+    def run(self):
+        """Aplica a política; o custo acompanha o que entra/sai das camadas, não o tamanho do acervo"""
+        try:
+            self._age_out_recent()
+            for tier in (TIER_DAILY, TIER_WEEKLY, TIER_MONTHLY):
+                self._age_out(tier)
+            self._enforce_budget()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        if self.dry_run:
+            self.conn.rollback()
+        else:
+            self.conn.commit()
+            for sha256 in self._orphans:
+                self.store.delete_blob(sha256)
+            for source in self._touched:
+                self.store.write_history(source, self.catalog.entries_for(source))
+
+        self.report["total_bytes"] = self.catalog.total_bytes()
+        return self.report
+
+
+def collect_garbage(project_root, dry_run=False):
+    """Executa a coleta de lixo dos backups e imprime o relatório"""
+    from pathlib import Path
+    project_root = Path(project_root)
+    store = BackupStore(project_root / "backups", project_root)
+    report = GarbageCollector(store, dry_run=dry_run).run()
+
+    prefix = "🔎 (simulação) " if dry_run else ""
+    print(f"{prefix}🗑️  Backups removidos: {report['removed']}")
+    print(f"{prefix}📦 Backups afinados (diário/semanal/mensal): {report['promoted']}")
+    print(f"{prefix}💾 Blobs apagados: {report['blobs_deleted']} ({report['bytes_freed']} bytes)")
+    print(f"📊 Total ocupado: {report['total_bytes']} bytes")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    collect_garbage(args[0] if args else "D:/projetos/desenrola_dcl", dry_run="--dry-run" in sys.argv)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Armazenamento de backups endereçado por conteúdo (sem cópias repetidas)
+Cada conteúdo distinto vira um blob gravado uma única vez em objects/,
+e um pequeno histórico por arquivo (history/*.jsonl) aponta para os blobs.
+Os blobs são comprimidos e, quando compensa, gravados como delta da versão anterior
+"""
+
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+import blob_codec
+import fast_copy
+from atomic_io import atomic_write_bytes
+from profiling import span
+
+CHUNK_SIZE = 1024 * 1024
+ENCODED_SUFFIX = ".dz"
+
+# Sobrescrito por backups/store.json; codec "raw" grava cópias integrais como antes
+DEFAULT_CONFIG = {
+    "codec": "zlib",          # zlib | lzma | raw
+    "delta": True,            # grava versões como delta da anterior
+    "keyframe_interval": 10,  # no máximo K-1 deltas encadeados até uma versão completa
+}
+
+
+def hash_file(file_path):
+    """Calcula o SHA-256 de um arquivo lendo em blocos"""
+    digest = hashlib.sha256()
+    with span("hash", file_path) as s, open(file_path, 'rb') as f:
+        size = 0
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+        s.nbytes = size
+    return digest.hexdigest()
+
+
+class BackupStore:
+    def __init__(self, backup_dir, project_root=None, **config):
+        self.backup_dir = Path(backup_dir)
+        self.project_root = Path(project_root) if project_root else None
+        self.objects_dir = self.backup_dir / "objects"
+        self.history_dir = self.backup_dir / "history"
+        self.snapshots_dir = self.backup_dir / "snapshots"
+        self.catalog_path = self.backup_dir / "catalog.sqlite"
+        self._catalog = None
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+
+        self.config = dict(DEFAULT_CONFIG)
+        config_path = self.backup_dir / "store.json"
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                self.config.update(json.load(f))
+        self.config.update(config)
+
+    @property
+    def catalog(self):
+        """Catálogo SQLite (aberto sob demanda; recriado dos históricos se não existir)"""
+        if self._catalog is None:
+            from backup_catalog import BackupCatalog
+            is_new = not self.catalog_path.exists()
+            self._catalog = BackupCatalog(self.catalog_path)
+            if is_new:
+                self._catalog.rebuild(self.iter_entries(), self.blob_info, self.iter_snapshots())
+        return self._catalog
+
+    def source_key(self, file_path):
+        """Identificador estável do arquivo de origem (relativo ao projeto quando possível)"""
+        file_path = Path(file_path).absolute()
+        if self.project_root:
+            try:
+                return file_path.relative_to(self.project_root.absolute()).as_posix()
+            except ValueError:
+                pass
+        return file_path.as_posix()
+
+    def blob_path(self, sha256):
+        """Caminho do blob para um hash (cópia integral, sem codificação)"""
+        return self.objects_dir / sha256[:2] / sha256[2:]
+
+    def encoded_path(self, sha256):
+        """Caminho do blob comprimido/delta para um hash"""
+        return self.objects_dir / sha256[:2] / (sha256[2:] + ENCODED_SUFFIX)
+
+    def stored_path(self, sha256):
+        """Arquivo que guarda o blob (integral ou codificado), ou None"""
+        for path in (self.blob_path(sha256), self.encoded_path(sha256)):
+            if path.exists():
+                return path
+        return None
+
+    def blob_info(self, sha256):
+        """(bytes em disco, hash da base do delta ou None)"""
+        path = self.stored_path(sha256)
+        if path is None:
+            return 0, None
+        base = blob_codec.read_header(path).get("base") if path.suffix == ENCODED_SUFFIX else None
+        return path.stat().st_size, base
+
+    def raw_size(self, sha256):
+        """Tamanho original do conteúdo de um blob"""
+        path = self.stored_path(sha256)
+        if path.suffix == ENCODED_SUFFIX:
+            return blob_codec.read_header(path)["size"]
+        return path.stat().st_size
+
+    def _depth(self, sha256):
+        path = self.stored_path(sha256)
+        if path is None or path.suffix != ENCODED_SUFFIX:
+            return 0
+        return blob_codec.read_header(path).get("depth", 0)
+
+    def read_blob(self, sha256):
+        """Conteúdo original de um blob (aplica no máximo K-1 deltas)"""
+        path = self.stored_path(sha256)
+        if path is None:
+            raise FileNotFoundError(f"blob {sha256} não encontrado")
+        if path.suffix != ENCODED_SUFFIX:
+            return path.read_bytes()
+
+        header, payload = blob_codec.unpack(path.read_bytes())
+        data = blob_codec.decompress(payload, header["codec"])
+        if header["kind"] == "delta":
+            data = blob_codec.apply_delta(self.read_blob(header["base"]), data)
+        return data
+
+    def history_path(self, source):
+        """Arquivo de histórico de uma origem"""
+        key = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+        return self.history_dir / f"{Path(source).name}-{key}.jsonl"
+
+    def history(self, file_path):
+        """Lista as entradas de histórico de um arquivo (mais antiga primeiro)"""
+        history_path = self.history_path(self.source_key(file_path))
+        if not history_path.exists():
+            return []
+        with open(history_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def last_entry(self, file_path):
+        """Última entrada do histórico, lendo apenas o final do arquivo"""
+        history_path = self.history_path(self.source_key(file_path))
+        if not history_path.exists():
+            return None
+        with open(history_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            size = min(end, 4096)
+            while True:
+                f.seek(end - size)
+                lines = f.read(size).rstrip(b'\n').split(b'\n')
+                if len(lines) > 1 or size == end:
+                    break
+                size = min(end, size * 2)
+        return json.loads(lines[-1]) if lines[-1] else None
+
+    def write_history(self, source, entries):
+        """Regrava o histórico de uma origem (usado pela coleta de lixo)"""
+        history_path = self.history_path(source)
+        if not entries:
+            history_path.unlink(missing_ok=True)
+            return
+        tmp_path = history_path.with_name(f".{history_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, history_path)
+
+    def delete_blob(self, sha256):
+        """Apaga um blob que não é mais referenciado"""
+        self.blob_path(sha256).unlink(missing_ok=True)
+        self.encoded_path(sha256).unlink(missing_ok=True)
+
+    def iter_entries(self):
+        """Percorre todas as entradas de todos os históricos"""
+        for history_path in sorted(self.history_dir.glob("*.jsonl")):
+            with open(history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def iter_snapshots(self):
+        """Snapshots gravados em snapshots/*.json (veja snapshots.py)"""
+        if not self.snapshots_dir.is_dir():
+            return
+        for path in sorted(self.snapshots_dir.glob("*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+
+    def _publish(self, sha256, blob):
+        """Grava um blob codificado de forma atômica"""
+        path = self.encoded_path(sha256)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, prefix=".ingest-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return path
+
+    def _encode(self, file_path, sha256, before, base_sha256):
+        """
+        Lê o arquivo e grava o blob comprimido; vira delta da versão anterior
+        quando fica menor e a cadeia ainda não chegou ao keyframe.
+        sha256/before: hash e stat de quem chamou (só se refaz o hash se o arquivo mudou)
+        """
+        data = Path(file_path).read_bytes()
+        after = os.stat(file_path)
+        if (after.st_mtime_ns, after.st_size, len(data)) != (before.st_mtime_ns, before.st_size, before.st_size):
+            # Mudou depois do hash: vale o hash do que foi lido
+            sha256 = hashlib.sha256(data).hexdigest()
+            if self.stored_path(sha256):
+                return sha256
+
+        codec = self.config["codec"]
+        header = {"codec": codec, "kind": "full", "depth": 0, "size": len(data)}
+        payload = blob_codec.compress(data, codec)
+
+        if self.config["delta"] and base_sha256 and self.stored_path(base_sha256):
+            depth = self._depth(base_sha256) + 1
+            if depth < self.config["keyframe_interval"]:
+                delta = blob_codec.make_delta(self.read_blob(base_sha256), data)
+                delta_payload = blob_codec.compress(delta, codec)
+                if len(delta_payload) < len(payload):
+                    header.update(kind="delta", base=base_sha256, depth=depth)
+                    payload = delta_payload
+
+        self._publish(sha256, blob_codec.pack(header, payload))
+        return sha256
+
+    def _clone(self, file_path, sha256, before):
+        """
+        Publica o arquivo como blob integral sem passar os bytes pelo Python
+        (reflink, copy_file_range ou sendfile; veja fast_copy). Devolve (sha256, método)
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, prefix=".ingest-")
+        os.close(fd)
+        try:
+            method = fast_copy.copy_file(file_path, tmp_name)
+            after = os.stat(file_path)
+            if (after.st_mtime_ns, after.st_size) != (before.st_mtime_ns, before.st_size):
+                # Mudou durante a cópia: vale o hash do que foi gravado
+                sha256 = hash_file(tmp_name)
+            blob_path = self.blob_path(sha256)
+            if blob_path.exists():
+                os.unlink(tmp_name)
+            else:
+                blob_path.parent.mkdir(exist_ok=True)
+                shutil.copystat(file_path, tmp_name)
+                os.replace(tmp_name, blob_path)
+            return sha256, method
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def put_blob(self, file_path, sha256, before, base_sha256=None):
+        """
+        Garante o blob com o conteúdo do arquivo. Devolve (sha256, método); método None se já existia.
+        before: stat tirado antes do hash (para perceber mudanças durante a cópia)
+        """
+        if self.stored_path(sha256):
+            return sha256, None
+        # O arquivo pode ter mudado entre o hash e a cópia: vale o hash do que foi gravado
+        with span("copy", file_path):
+            if self.config["codec"] == "raw":
+                return self._clone(file_path, sha256, before)
+            return self._encode(file_path, sha256, before, base_sha256), self.config["codec"]
+
+    def backup(self, file_path, label=None, known=None):
+        """
+        Registra um backup do arquivo. Retorna (caminho_do_blob, criado).
+        Se o conteúdo não mudou desde o último backup, custa só um hash: nada é copiado.
+        known: registro do manifesto de integridade (mtime_ns, size, sha256); com o stat
+        igual, o hash dele é usado e o arquivo nem é lido
+        """
+        path, entry = self._backup(file_path, label, known)
+        return path, entry is not None
+
+    def _backup(self, file_path, label, known):
+        """backup() devolvendo a entrada gravada no histórico (None se nada mudou)"""
+        file_path = Path(file_path)
+        source = self.source_key(file_path)
+        before = os.stat(file_path)
+        if known and (known["mtime_ns"], known["size"]) == (before.st_mtime_ns, before.st_size):
+            sha256 = known["sha256"]
+        else:
+            sha256 = hash_file(file_path)
+
+        last = self.last_entry(file_path)
+        if last and last['sha256'] == sha256 and self.stored_path(sha256):
+            return self.stored_path(sha256), None
+
+        sha256, method = self.put_blob(file_path, sha256, before, last['sha256'] if last else None)
+
+        path = self.stored_path(sha256)
+        stored_size, base = self.blob_info(sha256)
+        entry = {
+            "source": source,
+            "sha256": sha256,
+            "size": self.raw_size(sha256),
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+        }
+        if label:
+            entry["label"] = label
+        if method:
+            entry["method"] = method
+
+        catalog = self.catalog  # abre (ou recria) o catálogo antes de gravar o histórico
+        with span("write", file_path):
+            with open(self.history_path(source), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            catalog.record(entry, stored_size, base, method)
+        return path, entry
+
+    def scan_tree(self, root):
+        """
+        (pasta relativa ao projeto, resultado do ManifestScanner) com um manifesto
+        próprio da pasta em .desenrola/: só arquivos com stat alterado são relidos
+        """
+        from integrity_scan import ManifestScanner
+
+        root = Path(root)
+        if root.is_absolute():
+            root = root.relative_to(self.project_root.absolute())
+        root = root.as_posix().strip("/")
+        manifest = f"backup-manifest-{root.replace('/', '_')}.json"
+        return root, ManifestScanner(self.project_root, (root,), manifest).scan()
+
+    def backup_tree(self, root, label=None):
+        """
+        Backup de todos os arquivos de uma pasta do projeto. O manifesto de integridade
+        (.desenrola/) fornece os hashes: arquivos com stat inalterado não são lidos
+        e, com codec raw, os novos viram clones. Devolve os totais e {método: arquivos}
+        """
+        _, scan = self.scan_tree(root)
+        result = {"files": len(scan["files"]), "created": 0, "methods": {}}
+        for rel, record in sorted(scan["files"].items()):
+            _, entry = self._backup(self.project_root / rel, label, record)
+            if entry:
+                result["created"] += 1
+                method = entry.get("method", "dedup")   # sem método: o blob já existia
+                result["methods"][method] = result["methods"].get(method, 0) + 1
+        return result
+
+    def restore(self, file_path, sha256=None, target=None):
+        """Restaura uma versão (a mais recente por padrão) de um arquivo"""
+        if sha256 is None:
+            last = self.last_entry(file_path)
+            if not last:
+                return None
+            sha256 = last['sha256']
+
+        if not self.stored_path(sha256):
+            return None
+
+        with span("read", file_path) as s:
+            data = self.read_blob(sha256)
+            s.nbytes = len(data)
+        with span("hash", file_path):
+            if hashlib.sha256(data).hexdigest() != sha256:
+                raise ValueError(f"blob {sha256} corrompido")
+
+        # Mantém o modo do arquivo existente (novos seguem a umask) e não deixa temporário em caso de erro
+        target = Path(target or file_path)
+        atomic_write_bytes(target, data)
+        return target
+
+    def space_report(self):
+        """Espaço ocupado comparado com o formato antigo (uma cópia integral por backup)"""
+        return self.catalog.space_report()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: verificações com str.count/`in` por regra x matcher compilado de passada única
+Mostra o tempo por número de regras (6 a 500) sobre os arquivos .tsx do projeto.
+Nenhum dos dois é constante: str.count cresce linearmente com as regras e a regex bem menos;
+o matcher usa str.count até SMALL_SET padrões, onde a regex passa a ganhar
+"""
+
+import sys
+import time
+import random
+import string
+from pathlib import Path
+
+from matcher import SMALL_SET, compile_matcher
+
+BASE_PATTERNS = ["'use client'", "export function", "import { useState }", "from 'lucide-react'",
+                 "const NAVIGATION_ITEMS", "bg-white/80 backdrop-blur-lg"]
+RULE_COUNTS = (6, 25, 40, 50, 100, 250, 500)
+REPEAT = 5
+
+
+def load_corpus(project_root):
+    """Concatena os .tsx de src/ (ou gera um texto sintético se não houver projeto)"""
+    files = sorted(Path(project_root, "src").rglob("*.tsx"))
+    if files:
+        return "\n".join(f.read_text(encoding='utf-8', errors='replace') for f in files)
+    return "\n".join(f"<div className=\"p-{i} text-sm\">{{item.name}}</div>" for i in range(50000))
+
+
+def make_patterns(n, seed=42):
+    """Padrões base + identificadores sintéticos, como regras adicionadas ao manifesto"""
+    rng = random.Random(seed)
+    patterns = list(BASE_PATTERNS)
+    while len(patterns) < n:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 14)))
+        patterns.append(rng.choice(["const ", "use", "<", "data-", ""]) + word)
+    return patterns[:n]
+
+
+def best_of(func):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(project_root):
+    text = load_corpus(project_root)
+    print(f"📄 Texto: {len(text)} caracteres")
+    print(f"{'regras':>7} | {'str.count (ms)':>15} | {'compilado (ms)':>15} | {'compilação (ms)':>16} | caminho")
+    print("-" * 76)
+
+    for n in RULE_COUNTS:
+        patterns = make_patterns(n)
+
+        naive = best_of(lambda: {p: text.count(p) for p in patterns})
+
+        started = time.perf_counter()
+        matcher = compile_matcher(patterns)
+        build = time.perf_counter() - started
+
+        single = best_of(lambda: matcher.counts(text))
+        assert matcher.counts(text) == {p: text.count(p) for p in patterns}
+        path = "str.count" if len(matcher.patterns) <= SMALL_SET else "regex"
+        print(f"{n:>7} | {naive * 1000:>15.2f} | {single * 1000:>15.2f} | {build * 1000:>16.2f} | {path}")
+
+    print("\nℹ️  O tempo do matcher compilado cresce com o número de regras (a regex é tentada em mais")
+    print(f"   posições), só que mais devagar que str.count; até {SMALL_SET} regras ele usa str.count")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "D:/projetos/desenrola_dcl")
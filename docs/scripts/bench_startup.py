@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark de partida da CLI: `cli.py verify <arquivo>` num interpretador novo a cada execução
+(o cenário de um hook de pre-commit). Meta: menos de 50 ms
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+CLI = Path(__file__).parent / "cli.py"
+RUNS = 20
+BUDGET_MS = 50
+
+SAMPLE = """'use client'
+
+export function Exemplo() {
+  return <div className="p-4">Exemplo</div>
+}
+"""
+
+
+def time_run(command, env):
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = (time.perf_counter() - started) * 1000
+    if completed.returncode not in (0, 1):
+        raise RuntimeError(completed.stderr.decode('utf-8', 'replace'))
+    return elapsed
+
+
+def import_profile(command, env, top=8):
+    """Módulos mais caros na importação (python -X importtime)"""
+    completed = subprocess.run([sys.executable, "-X", "importtime"] + command[1:], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run_benchmark(project_root=None, target=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        if project_root is None:
+            project_root = Path(tmp)
+            target = "src/components/Exemplo.tsx"
+            (project_root / "src" / "components").mkdir(parents=True)
+            (project_root / target).write_text(SAMPLE, encoding='utf-8')
+
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+        command = [sys.executable, str(CLI), "--root", str(project_root), "verify", "-q", target]
+        baseline = [sys.executable, "-c", "pass"]
+
+        time_run(command, env)   # gera os .pyc, como numa instalação normal
+        timings = [time_run(command, env) for _ in range(RUNS)]
+        interpreter = [time_run(baseline, env) for _ in range(RUNS)]
+
+        median = statistics.median(timings)
+        print(f"🚀 cli.py verify {target} ({RUNS} execuções, processo novo a cada uma)")
+        print(f"   mínimo {min(timings):.1f} ms | mediana {median:.1f} ms | máximo {max(timings):.1f} ms")
+        print(f"   (interpretador vazio: mediana {statistics.median(interpreter):.1f} ms)")
+
+        print("\n📦 Importações mais caras (self, µs):")
+        for self_us, cumulative_us, name in import_profile(command, env):
+            print(f"   {self_us:>7} {cumulative_us:>8}  {name}")
+
+        status = "✅" if median < BUDGET_MS else "❌"
+        print(f"\n{status} Meta: mediana < {BUDGET_MS} ms")
+        return median
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        run_benchmark(Path(sys.argv[1]), sys.argv[2])
+    else:
+        run_benchmark()
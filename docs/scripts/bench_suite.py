@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks das ferramentas de manutenção sobre árvores sintéticas (1k, 10k, 100k arquivos)
+Mede backup, verify-all, scan, stats e list-backups a frio (estado vazio) e a quente (repetição),
+grava o resultado em JSON e compara com uma execução anterior para achar regressões
+
+Uso:
+  python bench_suite.py --sizes 1k,10k --output atual.json
+  python bench_suite.py --sizes 1k --compare atual.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime
+
+from synthetic_tree import generate
+from integrity_scan import ManifestScanner, STATE_DIRNAME, iter_files
+from verify_rules import verify_all, DEFAULT_ROOTS
+from backup_store import BackupStore
+from matcher import compile_matcher
+from tree_stats import STATS_PATTERNS, TreeStats
+
+REPEAT = 3
+REGRESSION_THRESHOLD = 0.20   # 20% mais lento
+NOISE_FLOOR_MS = 5.0          # diferenças menores que isso são ruído
+
+
+def parse_size(text):
+    """'1k' -> 1000, '100k' -> 100000, '2500' -> 2500"""
+    text = text.strip().lower()
+    return int(float(text[:-1]) * 1000) if text.endswith("k") else int(text)
+
+
+def tree_files(project_root):
+    files = []
+    for root in DEFAULT_ROOTS:
+        base_dir = Path(project_root) / root
+        if base_dir.is_dir():
+            files.extend(entry.path for entry, _ in iter_files(base_dir))
+    return sorted(files)
+
+
+def reset_state(project_root):
+    """Apaga o estado das ferramentas (backups, manifestos), mantendo a árvore"""
+    for name in ("backups", STATE_DIRNAME):
+        shutil.rmtree(Path(project_root) / name, ignore_errors=True)
+
+
+# Cenários: cada um recebe (raiz, arquivos) e devolve um resumo do que processou
+
+def bench_backup(project_root, files):
+    store = BackupStore(Path(project_root) / "backups", project_root)
+    created = sum(store.backup(path)[1] for path in files)
+    return {"files": len(files), "created": created}
+
+
+def bench_verify_all(project_root, files):
+    results = list(verify_all(project_root))
+    return {"files": len(results), "failures": sum(not r["ok"] for r in results)}
+
+
+def bench_scan(project_root, files):
+    result = ManifestScanner(project_root, roots=DEFAULT_ROOTS).scan()
+    return {"files": len(result["files"]), "rehashed": result["rehashed"]}
+
+
+def bench_stats(project_root, files):
+    matcher = compile_matcher(STATS_PATTERNS)
+    totals = dict.fromkeys(STATS_PATTERNS, 0)
+    scanned = 0
+    for path in files:
+        if path.endswith(".tsx"):
+            for pattern, count in matcher.scan_file(path)["counts"].items():
+                totals[pattern] += count
+            scanned += 1
+    return {"files": scanned, "className": totals["className"]}
+
+
+def bench_tree_stats(project_root, files):
+    stats = TreeStats(project_root)
+    build = stats.build()
+    return {"files": build["files"], "measured": build["measured"]}
+
+
+def bench_list_backups(project_root, files):
+    catalog = BackupStore(Path(project_root) / "backups", project_root).catalog
+    total = catalog.count()
+    listed, cursor = 0, None
+    while True:
+        rows, cursor = catalog.query(limit=500, after=cursor)
+        listed += len(rows)
+        if cursor is None:
+            break
+    catalog.conn.close()
+    return {"files": total, "listed": listed}
+
+
+# A ordem importa: list-backups lê o catálogo criado pelo backup
+SCENARIOS = [
+    ("backup", bench_backup),
+    ("verify-all", bench_verify_all),
+    ("scan", bench_scan),
+    ("stats", bench_stats),
+    ("tree-stats", bench_tree_stats),
+    ("list-backups", bench_list_backups),
+]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    info = func(*args)
+    return (time.perf_counter() - started) * 1000, info
+
+
+def run_size(project_root, n_files, repeat=REPEAT, seed=42):
+    """Gera (ou reaproveita) a árvore e mede cada cenário a frio e a quente"""
+    started = time.perf_counter()
+    generate(project_root, n_files, seed)
+    generation_ms = (time.perf_counter() - started) * 1000
+    files = tree_files(project_root)
+    reset_state(project_root)
+
+    results = {}
+    for name, func in SCENARIOS:
+        cold_ms, info = timed(func, project_root, files)
+        warm = [timed(func, project_root, files)[0] for _ in range(repeat)]
+        results[name] = dict(info, cold_ms=round(cold_ms, 2), warm_ms=round(statistics.median(warm), 2))
+        print(f"   {name:<13} frio {cold_ms:>10.1f} ms | quente {statistics.median(warm):>10.1f} ms | {info}")
+    return {"files": len(files), "generation_ms": round(generation_ms, 1), "scenarios": results}
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Lista (tamanho, cenário, fase, antes, depois) de tudo que ficou mais lento que o limite"""
+    regressions = []
+    for size, data in current["results"].items():
+        old = baseline.get("results", {}).get(size)
+        if not old:
+            continue
+        for name, new_scenario in data["scenarios"].items():
+            old_scenario = old["scenarios"].get(name)
+            if not old_scenario:
+                continue
+            for phase in ("cold_ms", "warm_ms"):
+                before, after = old_scenario[phase], new_scenario[phase]
+                if after - before > NOISE_FLOOR_MS and after > before * (1 + threshold):
+                    regressions.append((size, name, phase, before, after))
+    return regressions
+
+
+def print_comparison(current, baseline):
+    print("\n📊 Comparação com a execução anterior:")
+    for size, data in current["results"].items():
+        old = baseline.get("results", {}).get(size)
+        if not old:
+            print(f"   {size}: sem referência")
+            continue
+        for name, scenario in data["scenarios"].items():
+            old_scenario = old["scenarios"].get(name)
+            if not old_scenario:
+                continue
+            deltas = []
+            for phase in ("cold_ms", "warm_ms"):
+                before, after = old_scenario[phase], scenario[phase]
+                change = (after - before) / before if before else 0.0
+                deltas.append(f"{phase[:-3]} {before:.1f} → {after:.1f} ms ({change:+.0%})")
+            print(f"   {size} {name:<13} {' | '.join(deltas)}")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmarks das ferramentas de manutenção")
+    parser.add_argument("--sizes", default="1k", help="tamanhos das árvores (ex.: 1k,10k,100k)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="execuções a quente (mediana)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="onde gerar as árvores (reaproveitadas entre execuções)")
+    parser.add_argument("--output", help="arquivo JSON de saída")
+    parser.add_argument("--compare", help="JSON de uma execução anterior")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = {
+        "version": 1,
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": {},
+    }
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="desenrola-bench-"))
+    try:
+        for size in args.sizes.split(","):
+            n_files = parse_size(size)
+            print(f"\n🌳 Árvore com {n_files} arquivos ({workdir / size.strip()})")
+            report["results"][size.strip()] = run_size(workdir / size.strip(), n_files, args.repeat, args.seed)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = Path(args.output or f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n💾 Resultado salvo em {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print_comparison(report, baseline)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressão(ões) acima de {args.threshold:.0%}:")
+            for size, name, phase, before, after in regressions:
+                print(f"   {size} {name} {phase[:-3]}: {before:.1f} → {after:.1f} ms")
+            return 1
+        print("\n✅ Nenhuma regressão")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Codificação dos blobs de backup: compressão (zlib/lzma) e delta por linhas
+Formato do arquivo .dz: uma linha de cabeçalho JSON seguida do conteúdo comprimido
+"""
+
+import json
+import lzma
+import zlib
+
+from line_diff import diff_lines
+
+MAGIC = b"DZ1 "
+
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+
+def compress(data, codec):
+    return CODECS[codec][0](data)
+
+
+def decompress(data, codec):
+    return CODECS[codec][1](data)
+
+
+def pack(header, payload):
+    """Monta o blob codificado: MAGIC + cabeçalho JSON + '\\n' + payload"""
+    return MAGIC + json.dumps(header, separators=(',', ':')).encode('utf-8') + b"\n" + payload
+
+
+def unpack(blob):
+    """Separa cabeçalho e payload de um blob codificado"""
+    if not blob.startswith(MAGIC):
+        raise ValueError("blob sem cabeçalho DZ1")
+    header_end = blob.index(b"\n")
+    return json.loads(blob[len(MAGIC):header_end]), blob[header_end + 1:]
+
+
+def read_header(path):
+    """Lê só o cabeçalho de um blob codificado"""
+    with open(path, 'rb') as f:
+        line = f.readline()
+    return json.loads(line[len(MAGIC):])
+
+
+def make_delta(base, target):
+    """
+    Delta por linhas de base -> target: operações de cópia de faixas da base
+    e inserção de bytes novos ("C i j" / "I n" + dados)
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    out = []
+    for tag, i1, i2, j1, j2 in diff_lines(base_lines, target_lines):
+        if tag == "equal":
+            out.append(b"C %d %d\n" % (i1, i2))
+        elif j2 > j1:
+            data = b"".join(target_lines[j1:j2])
+            out.append(b"I %d\n" % len(data))
+            out.append(data)
+    return b"".join(out)
+
+
+def apply_delta(base, delta):
+    """Reconstrói o conteúdo aplicando um delta gerado por make_delta"""
+    base_lines = base.splitlines(keepends=True)
+    out, pos = [], 0
+    while pos < len(delta):
+        line_end = delta.index(b"\n", pos)
+        op, *args = delta[pos:line_end].split(b" ")
+        pos = line_end + 1
+        if op == b"C":
+            out.extend(base_lines[int(args[0]):int(args[1])])
+        else:
+            size = int(args[0])
+            out.append(delta[pos:pos + size])
+            pos += size
+    return b"".join(out)
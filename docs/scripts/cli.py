@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Linha de comando não interativa (CI, hooks do git)
+Cada subcomando importa só os módulos de que precisa, para a partida ser rápida.
+A implementação fica em cli_commands.py: o script principal é compilado a cada execução
+(só módulos importados ganham .pyc), e compilar a CLI inteira custava ~7 ms por partida
+
+Exemplos:
+  python cli.py verify src/components/layout/GlobalHeader.tsx
+  python cli.py backup src/app/page.tsx --label antes-do-merge
+  python cli.py list-backups --source src/app/page.tsx --limit 10
+  python cli.py scaffold specs/pedidos.json
+  python cli.py snapshot src --label antes-do-merge
+  python cli.py restore ultimo src/components --dry-run
+  python cli.py sql v_pedidos_kanban
+  python cli.py dupes --threshold 0.8
+  python cli.py docs "impressão térmica timeout"
+  python cli.py imports --top 20
+  python cli.py tree-stats --depth 3 --csv > stats.csv
+  python cli.py tailwind --top 50
+  python cli.py tailwind --class backdrop-blur-xl
+  python cli.py diff src/components/layout/GlobalHeader.tsx
+  python cli.py diff src/components/layout/GlobalHeader.tsx GlobalHeader.tsx.backup --json
+  python cli.py golden verify
+  python cli.py golden restore components/layout/GlobalHeader.tsx --repair
+  python cli.py golden add src/components/ui/button.tsx --check "export function Button=Exportação"
+"""
+
+import sys
+
+from cli_commands import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Subcomandos da linha de comando não interativa (ponto de entrada: cli.py)
+Cada subcomando importa só os módulos de que precisa, para a partida ser rápida
+"""
+
+import os
+import sys
+import argparse
+
+DEFAULT_ROOT = os.environ.get("DESENROLA_ROOT", "D:/projetos/desenrola_dcl")
+
+# Códigos de saída
+EXIT_OK, EXIT_FAILED, EXIT_ERROR = 0, 1, 2
+
+
+def resolve(project_root, path):
+    """Caminhos relativos são relativos à raiz do projeto"""
+    from pathlib import Path
+    path = Path(path)
+    return path if path.is_absolute() else Path(project_root) / path
+
+
+def relative_to_root(project_root, path):
+    """Caminho relativo à raiz em formato posix (None se estiver fora), sem pathlib"""
+    root = os.path.abspath(project_root)
+    path = os.path.abspath(os.path.join(root, path))
+    rel = os.path.relpath(path, root)
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep) or os.path.isabs(rel):
+        return None
+    return rel.replace(os.sep, '/')
+
+
+def cmd_verify(args):
+    """Regras de verify_rules.json nos arquivos dados (ou no projeto inteiro)"""
+    if not args.paths:
+        from verify_rules import run_verify_all
+        return EXIT_OK if run_verify_all(args.root, workers=args.workers) else EXIT_FAILED
+
+    from verify_rules import load_rules, compile_rules, rules_for, check_file
+
+    compiled = compile_rules(load_rules())
+    root = os.path.abspath(args.root)
+    status = EXIT_OK
+    for raw in args.paths:
+        rel = relative_to_root(root, raw)
+        if rel is None:
+            print(f"❌ {raw}: fora do projeto ({root})")
+            status = EXIT_ERROR
+            continue
+        if not os.path.isfile(os.path.join(root, rel)):
+            print(f"❌ {rel}: arquivo não encontrado")
+            status = EXIT_ERROR
+            continue
+
+        rules = rules_for(rel, compiled)
+        if not rules:
+            if not args.quiet:
+                print(f"➖ {rel}: nenhuma regra aplicável")
+            continue
+        result = check_file(root, rel, rules)
+        if result["ok"]:
+            if not args.quiet:
+                print(f"✅ {rel}")
+            continue
+        status = max(status, EXIT_FAILED)
+        print(f"❌ {rel}")
+        for description in result["missing"]:
+            print(f"   FALTANDO: {description}")
+        for description in result["forbidden"]:
+            print(f"   PROIBIDO: {description}")
+    return status
+
+
+def _store(project_root):
+    from pathlib import Path
+    from backup_store import BackupStore
+    project_root = Path(project_root)
+    backup_dir = project_root / "backups"
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    return BackupStore(backup_dir, project_root)
+
+
+def cmd_backup(args):
+    store = _store(args.root)
+    status = EXIT_OK
+    for raw in args.paths:
+        path = resolve(args.root, raw)
+        if path.is_dir():
+            result = store.backup_tree(path, label=args.label)
+            methods = ", ".join(f"{method} {count}" for method, count in result["methods"].items())
+            print(f"✅ {raw}: {result['created']} backup(s) de {result['files']} arquivo(s)"
+                  + (f" ({methods})" if methods else ""))
+            continue
+        if not path.is_file():
+            print(f"❌ {raw}: arquivo não encontrado")
+            status = EXIT_ERROR
+            continue
+        stored, created = store.backup(path, label=args.label)
+        if created:
+            print(f"✅ Backup criado: {stored}")
+        else:
+            print(f"♻️  Sem alterações desde o último backup: {stored}")
+    return status
+
+
+def cmd_restore(args):
+    from snapshots import Snapshots
+    snapshots = Snapshots(args.root)
+    snapshot_id = snapshots.resolve_id(args.path) if not args.sha and not args.target else None
+    if snapshot_id:
+        return _restore_snapshot(args, snapshots, snapshot_id)
+    if args.paths:
+        print(f"❌ {args.path}: snapshot não encontrado")
+        return EXIT_ERROR
+
+    store = _store(args.root)
+    path = resolve(args.root, args.path)
+
+    sha256 = None
+    if args.sha:
+        matches = {entry["sha256"] for entry in store.history(path) if entry["sha256"].startswith(args.sha)}
+        if len(matches) != 1:
+            print(f"❌ {'Nenhuma versão' if not matches else 'Prefixo ambíguo'} para {args.sha}")
+            return EXIT_ERROR
+        sha256 = matches.pop()
+
+    target = store.restore(path, sha256, resolve(args.root, args.target) if args.target else None)
+    if target is None:
+        print(f"❌ Nenhum backup de {args.path}")
+        return EXIT_ERROR
+    print(f"✅ Restaurado: {target}")
+    return EXIT_OK
+
+
+def _restore_snapshot(args, snapshots, snapshot_id):
+    from snapshots import SnapshotError, print_restore
+    paths = []
+    for raw in args.paths:
+        rel = relative_to_root(args.root, raw)
+        if rel is None:
+            print(f"❌ {raw}: fora da raiz do projeto")
+            return EXIT_ERROR
+        paths.append(rel)
+    try:
+        result = snapshots.restore(snapshot_id, paths, args.delete_extra, args.dry_run)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        return EXIT_ERROR
+    print_restore(result, args.dry_run)
+    return EXIT_OK
+
+
+def cmd_snapshot(args):
+    from snapshots import Snapshots, SnapshotError, print_snapshots
+    snapshots = Snapshots(args.root)
+    if args.list:
+        print_snapshots(snapshots.list())
+        return EXIT_OK
+    if args.delete:
+        snapshot_id = snapshots.resolve_id(args.delete)
+        if not snapshot_id:
+            print(f"❌ {args.delete}: snapshot não encontrado")
+            return EXIT_ERROR
+        orphans = snapshots.delete(snapshot_id)
+        print(f"🗑️  Snapshot {snapshot_id} apagado ({len(orphans)} blob(s) liberado(s))")
+        return EXIT_OK
+    try:
+        info = snapshots.create(args.folder, args.label)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        return EXIT_ERROR
+    print(f"📸 Snapshot {info['id']} de {info['root']}/: {info['files']} arquivo(s), "
+          f"{info['new_blobs']} blob(s) novo(s), {info['rehashed']} relido(s) em {info['elapsed'] * 1000:.1f} ms")
+    return EXIT_OK
+
+
+def cmd_stats(args):
+    from tree_stats import STATS_PATTERNS
+    from matcher import compile_matcher
+
+    path = resolve(args.root, args.path)
+    if not path.is_file():
+        print(f"❌ {args.path}: arquivo não encontrado")
+        return EXIT_ERROR
+    result = compile_matcher(STATS_PATTERNS).scan_file(path)
+    print(f"📄 Linhas: {result['lines']}")
+    print(f"💾 Tamanho: {result['chars']} caracteres")
+    for pattern in STATS_PATTERNS:
+        print(f"   {pattern.strip():<10} {result['counts'][pattern]}")
+    return EXIT_OK
+
+
+def cmd_list_backups(args):
+    from datetime import datetime
+
+    catalog = _store(args.root).catalog
+    after = None
+    if args.after:
+        value, row_id = args.after.rsplit(",", 1)
+        after = (float(value), int(row_id))
+
+    rows, cursor = catalog.query(source=args.source, since=args.since, until=args.until,
+                                 order=args.order, limit=args.limit, after=after)
+    if not rows:
+        print("📁 Nenhum backup no catálogo")
+        return EXIT_OK
+    for row in rows:
+        when = datetime.fromtimestamp(row['created_at']).strftime("%d/%m/%Y %H:%M")
+        print(f"{row['sha256'][:12]}  {when}  {row['size']:>10}  {row['source']}")
+    if cursor is not None:
+        print(f"➤ Próxima página: --after {cursor[0]},{cursor[1]}")
+    return EXIT_OK
+
+
+def cmd_scaffold(args):
+    from scaffold import scaffold, run_scaffold, ScaffoldError
+
+    backup = _store(args.root).backup if args.backup else None
+    templates = args.templates or resolve(args.root, "templates")
+    if args.spec:
+        written = run_scaffold(args.root, args.spec, templates, args.overwrite, backup)
+        return EXIT_OK if written is not None else EXIT_ERROR
+
+    kind = "pages" if args.type == "page" else "components"
+    try:
+        written = scaffold(args.root, {kind: [{"name": name, "type": args.type} for name in args.name]},
+                           templates, args.overwrite, backup)
+    except (ScaffoldError, OSError) as e:
+        print(f"❌ {e}")
+        return EXIT_ERROR
+    for path in written:
+        print(f"✅ {path}")
+    return EXIT_OK
+
+
+def cmd_sql(args):
+    from sql_index import run_lookup
+    return EXIT_OK if run_lookup(args.root, args.name, args.type, args.like) else EXIT_FAILED
+
+
+def cmd_dupes(args):
+    from near_duplicates import find_near_duplicates
+    clusters = find_near_duplicates(args.root, args.roots or ("database", "docs", "src"), args.threshold, args.json)
+    return EXIT_FAILED if clusters else EXIT_OK
+
+
+def cmd_docs(args):
+    from docs_search import run_search
+    return EXIT_OK if run_search(args.root, " ".join(args.query), args.limit) else EXIT_FAILED
+
+
+def cmd_imports(args):
+    from import_graph import run_import_graph
+    report = run_import_graph(args.root, args.top, args.json, args.workers)
+    return EXIT_FAILED if report["cycles"] or report["unresolved"] else EXIT_OK
+
+
+def cmd_tree_stats(args):
+    from tree_stats import run_tree_stats
+    output = "json" if args.json else "csv" if args.csv else "text"
+    run_tree_stats(args.root, args.top, args.depth, output, args.per_file, args.workers)
+    return EXIT_OK
+
+
+def cmd_tailwind(args):
+    from tailwind_index import run_tailwind
+    run_tailwind(args.root, args.top, args.threshold, args.cls, args.json)
+    return EXIT_OK
+
+
+def _old_version(args, store, path):
+    """
+    (conteúdo, rótulo) da versão antiga: último backup, um arquivo (.backup), um hash
+    (ou prefixo) do histórico ou um snapshot (id, prefixo ou 'ultimo')
+    """
+    rel = relative_to_root(args.root, path) or str(path)
+    if not args.backup:
+        entry = store.last_entry(path)
+        if not entry:
+            raise LookupError(f"nenhum backup de {rel}")
+        return store.read_blob(entry["sha256"]), f"{rel} (backup {entry['sha256'][:12]}, {entry['timestamp']})"
+
+    other = resolve(args.root, args.backup)
+    for candidate in (other, args.backup):
+        if os.path.isfile(candidate):
+            with open(candidate, 'rb') as f:
+                return f.read(), str(args.backup)
+
+    matches = {entry["sha256"]: entry for entry in store.history(path) if entry["sha256"].startswith(args.backup)}
+    if len(matches) > 1:
+        raise LookupError(f"prefixo ambíguo: {args.backup}")
+    if matches:
+        entry = matches.popitem()[1]
+        return store.read_blob(entry["sha256"]), f"{rel} (backup {entry['sha256'][:12]}, {entry['timestamp']})"
+
+    from snapshots import Snapshots
+    snapshots = Snapshots(args.root)
+    snapshot_id = snapshots.resolve_id(args.backup)
+    if snapshot_id:
+        record = snapshots.load(snapshot_id)["files"].get(rel)
+        if record is None:
+            raise LookupError(f"{rel} não está no snapshot {snapshot_id}")
+        return store.read_blob(record[0]), f"{rel} (snapshot {snapshot_id})"
+    raise LookupError(f"{args.backup}: nem arquivo, nem backup, nem snapshot")
+
+
+def cmd_diff(args):
+    """Diferenças entre uma versão antiga e o arquivo atual (saída 1 se houver)"""
+    import json
+    from line_diff import diff_json, unified
+
+    store = _store(args.root)
+    path = resolve(args.root, args.path)
+    if not path.is_file():
+        print(f"❌ {args.path}: arquivo não encontrado")
+        return EXIT_ERROR
+    try:
+        old, old_label = _old_version(args, store, path)
+    except (LookupError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return EXIT_ERROR
+
+    new_label = relative_to_root(args.root, path) or str(path)
+    old_lines = old.splitlines(keepends=True)
+    new_lines = path.read_bytes().splitlines(keepends=True)
+    if args.json:
+        result = diff_json(old_lines, new_lines, old_label, new_label, args.context)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        changed = result["hunks"]
+    else:
+        text = unified(old_lines, new_lines, f"a/{old_label}", f"b/{new_label}", args.context)
+        sys.stdout.write(text or f"✅ Sem diferenças entre {old_label} e o arquivo atual\n")
+        changed = text
+    return EXIT_FAILED if changed else EXIT_OK
+
+
+def cmd_golden(args):
+    """Registro de arquivos canônicos: list, verify, restore (--repair) e add"""
+    from golden import GoldenError, get_registry, print_verify
+    from self_heal import print_repair
+
+    registry = get_registry()
+    try:
+        rels = []
+        for raw in args.paths:
+            rel = relative_to_root(args.root, raw)
+            if rel is None:
+                print(f"❌ {raw}: fora da raiz do projeto")
+                return EXIT_ERROR
+            if args.action != "add":
+                registry.entry(rel)
+            rels.append(rel)
+
+        if args.action == "list":
+            for rel in rels or registry.names():
+                entry = registry.entry(rel)
+                print(f"📄 {rel}  {entry['size']} bytes  sha256 {entry['sha256'][:12]}  "
+                      f"{len(entry['checks'])} trecho(s) obrigatório(s)")
+            return EXIT_OK
+
+        if args.action == "verify":
+            return EXIT_OK if print_verify(registry.verify(args.root, rels)) else EXIT_FAILED
+
+        if args.action == "add":
+            if not rels:
+                print("❌ golden add: informe os arquivos")
+                return EXIT_ERROR
+            checks = [tuple(check.split("=", 1)) if "=" in check else (check, check) for check in args.check]
+            for rel in rels:
+                entry = registry.register(rel, resolve(args.root, rel).read_bytes(), checks or None)
+                print(f"✅ {rel} registrado ({entry['size']} bytes, {entry['resource']})")
+            return EXIT_OK
+
+        store = _store(args.root)
+        for rel in rels or registry.names():
+            result = registry.restore(args.root, rel, args.repair, backup=store.backup)
+            if result["action"] == "repaired":
+                print_repair(result["repair"], rel)
+            elif result["action"] == "unchanged":
+                print(f"♻️  {rel}: já está igual ao canônico")
+            else:
+                print(f"✅ {rel}: {'criado' if result['action'] == 'created' else 'restaurado'}")
+        return EXIT_OK
+    except (GoldenError, OSError) as e:
+        print(f"❌ {e}")
+        return EXIT_ERROR
+
+
+def _args_verify(p):
+    p.add_argument("paths", nargs="*", help="arquivos (vazio = projeto inteiro)")
+    p.add_argument("-q", "--quiet", action="store_true", help="mostra só as falhas")
+    p.add_argument("--workers", type=int, help="processos na verificação completa")
+    p.set_defaults(func=cmd_verify)
+
+
+def _args_backup(p):
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--label")
+    p.set_defaults(func=cmd_backup)
+
+
+def _args_restore(p):
+    p.add_argument("path", help="arquivo, ou id do snapshot (prefixo ou 'ultimo')")
+    p.add_argument("paths", nargs="*", help="com snapshot: só estes arquivos/pastas")
+    p.add_argument("--sha", help="hash (ou prefixo) da versão")
+    p.add_argument("--target", help="grava em outro caminho")
+    p.add_argument("--delete-extra", action="store_true", help="com snapshot: apaga arquivos que não existiam")
+    p.add_argument("--dry-run", action="store_true", help="com snapshot: só mostra o que mudaria")
+    p.set_defaults(func=cmd_restore)
+
+
+def _args_snapshot(p):
+    p.add_argument("folder", nargs="?", default="src")
+    p.add_argument("--label")
+    p.add_argument("--list", action="store_true")
+    p.add_argument("--delete", metavar="ID")
+    p.set_defaults(func=cmd_snapshot)
+
+
+def _args_stats(p):
+    p.add_argument("path", nargs="?", default="components/layout/GlobalHeader.tsx")
+    p.set_defaults(func=cmd_stats)
+
+
+def _args_list_backups(p):
+    p.add_argument("--source", help="caminho relativo do arquivo")
+    p.add_argument("--since", help="data ISO inicial")
+    p.add_argument("--until", help="data ISO final")
+    p.add_argument("--order", choices=("recent", "oldest", "largest"), default="recent")
+    p.add_argument("--limit", type=int, default=50)
+    p.add_argument("--after", help="cursor da página anterior")
+    p.set_defaults(func=cmd_list_backups)
+
+
+def _args_scaffold(p):
+    p.add_argument("spec", nargs="?", help="spec JSON")
+    p.add_argument("--name", action="append", default=[], help="nome do componente (pode repetir)")
+    p.add_argument("--type", choices=("functional", "page"), default="functional")
+    p.add_argument("--templates", help="diretório com <tipo>.tpl (padrão: <raiz>/templates)")
+    p.add_argument("--overwrite", action="store_true")
+    p.add_argument("--backup", action="store_true", help="backup dos arquivos sobrescritos")
+    p.set_defaults(func=cmd_scaffold)
+
+
+def _args_sql(p):
+    p.add_argument("name", help="tabela, view, função, trigger... (curingas * e ? com --like)")
+    p.add_argument("--type", help="filtra pelo tipo (view, function, trigger...)")
+    p.add_argument("--like", action="store_true")
+    p.set_defaults(func=cmd_sql)
+
+
+def _args_dupes(p):
+    p.add_argument("roots", nargs="*", help="pastas (padrão: database docs src)")
+    p.add_argument("--threshold", type=float, default=0.6, help="similaridade mínima (Jaccard, 0-1)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_dupes)
+
+
+def _args_docs(p):
+    p.add_argument("query", nargs="+")
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(func=cmd_docs)
+
+
+def _args_imports(p):
+    p.add_argument("--top", type=int, default=15, help="quantos módulos mais importados mostrar")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--workers", type=int, help="processos na análise")
+    p.set_defaults(func=cmd_imports)
+
+
+def _args_tree_stats(p):
+    p.add_argument("--top", type=int, default=15, help="maiores arquivos listados")
+    p.add_argument("--depth", type=int, default=2, help="níveis de pasta abaixo de src/")
+    output = p.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true")
+    output.add_argument("--csv", action="store_true", help="uma linha por pasta")
+    p.add_argument("--per-file", action="store_true", help="com --csv: uma linha por arquivo")
+    p.add_argument("--workers", type=int, help="processos na medição")
+    p.set_defaults(func=cmd_tree_stats)
+
+
+def _args_tailwind(p):
+    p.add_argument("--top", type=int, default=30, help="classes mais usadas listadas")
+    p.add_argument("--threshold", type=float, default=0.8, help="similaridade mínima entre strings longas")
+    p.add_argument("--class", dest="cls", metavar="CLASSE", help="só os arquivos que usam esta classe")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_tailwind)
+
+
+def _args_diff(p):
+    p.add_argument("path")
+    p.add_argument("backup", nargs="?", help="arquivo, hash do backup ou snapshot (padrão: último backup)")
+    p.add_argument("-U", "--context", type=int, default=3, help="linhas de contexto")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_diff)
+
+
+def _args_golden(p):
+    p.add_argument("action", choices=("list", "verify", "restore", "add"))
+    p.add_argument("paths", nargs="*", help="arquivos (vazio = todos os registrados)")
+    p.add_argument("--repair", action="store_true", help="restore: reaplica só os trechos com problema")
+    p.add_argument("--check", action="append", default=[], metavar="TRECHO=DESCRIÇÃO",
+                   help="add: trecho que toda versão válida precisa conter")
+    p.set_defaults(func=cmd_golden)
+
+
+# (nome, ajuda, argumentos) de cada subcomando
+SUBCOMMANDS = [
+    ("verify", "verifica arquivos contra verify_rules.json", _args_verify),
+    ("backup", "faz backup de arquivos (ou de pastas inteiras)", _args_backup),
+    ("restore", "restaura um arquivo (última versão ou --sha) ou um snapshot", _args_restore),
+    ("snapshot", "snapshot de uma pasta inteira (--list, --delete)", _args_snapshot),
+    ("stats", "estatísticas de um arquivo", _args_stats),
+    ("list-backups", "lista backups do catálogo (paginado)", _args_list_backups),
+    ("scaffold", "gera componentes/páginas (spec JSON ou --name)", _args_scaffold),
+    ("sql", "scripts de database/ que criam, alteram ou removem um objeto", _args_sql),
+    ("dupes", "grupos de arquivos quase duplicados (MinHash/LSH)", _args_dupes),
+    ("docs", "busca na documentação Markdown (BM25, sem acentos)", _args_docs),
+    ("imports", "grafo de imports de src/: ciclos, órfãos e mais importados", _args_imports),
+    ("tree-stats", "estatísticas de todos os arquivos de src/, por pasta", _args_tree_stats),
+    ("tailwind", "índice das classes Tailwind de src/ (className e cn)", _args_tailwind),
+    ("diff", "diferenças entre um backup (ou .backup/snapshot) e o arquivo atual", _args_diff),
+    ("golden", "arquivos canônicos (golden/): list, verify, restore, add", _args_golden),
+]
+
+def requested_command(argv):
+    """Primeiro argumento posicional (o subcomando), pulando as opções globais; None com -h antes dele"""
+    tokens = iter(argv)
+    for token in tokens:
+        if token == "--root":
+            next(tokens, None)
+        elif token in ("-h", "--help"):
+            return None
+        elif not token.startswith("-"):
+            return token
+    return None
+
+
+def _formatter(prog):
+    """HelpFormatter com a largura já calculada (sem ela o argparse importa shutil a cada partida)"""
+    try:
+        width = int(os.environ["COLUMNS"])
+    except (KeyError, ValueError):
+        try:
+            width = os.get_terminal_size().columns
+        except OSError:
+            width = 80
+    return argparse.HelpFormatter(prog, width=width - 2)
+
+
+def build_parser(command=None):
+    """
+    Com `command`, só esse subcomando é montado (sem -h antes dele, a ajuda geral nunca aparece);
+    montar os 15 subcomandos a cada partida custava ~10 ms. Sem `command` (ou com um nome
+    desconhecido) monta todos, para a ajuda e as mensagens de erro listarem os subcomandos
+    """
+    parser = argparse.ArgumentParser(prog="cli.py", description="Ferramentas do projeto Desenrola DCL",
+                                     formatter_class=_formatter)
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="raiz do projeto (ou $DESENROLA_ROOT)")
+    parser.add_argument("--profile", action="store_true", help="mede cada etapa e grava .desenrola/profiles/")
+    parser.add_argument("--cprofile", action="store_true", help="--profile com saída do cProfile")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    known = command in {name for name, _, _ in SUBCOMMANDS}
+    for name, help_text, add_arguments in SUBCOMMANDS:
+        if not known or name == command:
+            add_arguments(sub.add_parser(name, help=help_text, formatter_class=_formatter))
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser(requested_command(argv))
+    args = parser.parse_args(argv)
+    if args.command == "scaffold" and not args.spec and not args.name:
+        parser.error("scaffold: informe um spec JSON ou --name")
+    if not (args.profile or args.cprofile):
+        return args.func(args)
+
+    from profiling import profile_run
+    with profile_run(args.command, args.root, cprofile=args.cprofile):
+        return args.func(args)
+
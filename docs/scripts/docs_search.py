@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Busca na documentação Markdown do projeto (raiz, docs/, database/...)
+Índice invertido em .desenrola/docs_index.sqlite com ranking BM25 e termos sem acento
+("impressão térmica" encontra "impressao termica"). Atualizado a partir do manifesto de
+integridade: só documentos cujo hash mudou são reindexados
+"""
+
+import os
+import re
+import math
+import time
+import sqlite3
+import unicodedata
+from collections import Counter
+
+from integrity_scan import ManifestScanner, state_dir
+from profiling import span
+
+# "." = projeto inteiro (node_modules, .next e afins já são ignorados pelo iter_files)
+DOC_ROOTS = (".",)
+DOC_EXTENSIONS = {".md"}
+INDEX_NAME = "docs_index.sqlite"
+MANIFEST_NAME = "docs_manifest.json"
+
+K1, B = 1.2, 0.75
+TITLE_WEIGHT = 3      # termos do nome do arquivo e dos títulos (#) contam como 3 ocorrências
+DEFAULT_LIMIT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    sha256 TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    title TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+"""
+
+_WORD = re.compile(r"\w+")
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$", re.M)
+
+STOPWORDS = {
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "no", "na", "nos", "nas", "um", "uma",
+    "para", "por", "com", "que", "se", "ao", "aos", "ou", "the", "and", "of", "to", "is", "in",
+}
+
+
+def fold(text):
+    """Minúsculas e sem acentos"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def stem(word):
+    """Plural → singular (impressoes → impressao, canais → canal, timeouts → timeout)"""
+    if len(word) <= 3 or not word.endswith("s"):
+        return word
+    if word.endswith(("oes", "aes")):
+        return word[:-3] + "ao"
+    if word.endswith("ais") or word.endswith("eis"):
+        return word[:-2] + "l"
+    if word.endswith("ns"):
+        return word[:-2] + "m"
+    if word.endswith("ss") or word.endswith("us") or word.endswith("is"):
+        return word
+    return word[:-1]
+
+
+def terms(text):
+    """Termos normalizados de um texto (também usado nas consultas)"""
+    return [stem(word) for word in _WORD.findall(fold(text)) if word not in STOPWORDS and len(word) > 1]
+
+
+def document_terms(rel, text):
+    """Frequência dos termos de um documento, com peso extra para nome do arquivo e títulos"""
+    counts = Counter(terms(text))
+    name = os.path.splitext(os.path.basename(rel))[0].replace("-", " ").replace("_", " ")
+    for heading_term in terms(name) + terms(" ".join(_HEADING.findall(text))):
+        counts[heading_term] += TITLE_WEIGHT - 1
+    return counts
+
+
+class DocsIndex:
+    def __init__(self, project_root, roots=DOC_ROOTS):
+        self.project_root = os.path.abspath(project_root)
+        self.roots = tuple(roots)
+        self.conn = sqlite3.connect(state_dir(self.project_root) / INDEX_NAME)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lengths = None
+
+    def close(self):
+        self.conn.close()
+
+    def _index_doc(self, rel, sha256):
+        with span("read", rel) as s:
+            with open(os.path.join(self.project_root, rel), 'rb') as f:
+                data = f.read()
+            s.nbytes = len(data)
+        with span("tokenize", rel):
+            text = data.decode('utf-8', errors='replace')
+            counts = document_terms(rel, text)
+            heading = _HEADING.search(text)
+        self._remove_doc(rel)
+        cursor = self.conn.execute("INSERT INTO docs (path, sha256, length, title) VALUES (?, ?, ?, ?)",
+                                   (rel, sha256, sum(counts.values()),
+                                    heading.group(1).strip() if heading else None))
+        self.conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                              [(term, cursor.lastrowid, tf) for term, tf in counts.items()])
+
+    def _remove_doc(self, rel):
+        row = self.conn.execute("SELECT id FROM docs WHERE path = ?", (rel,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (row[0],))
+            self.conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+
+    def update(self):
+        """
+        Atualiza o manifesto (só relê arquivos com stat diferente) e reindexa
+        os documentos cujo sha256 difere do indexado
+        """
+        started = time.perf_counter()
+        scan = ManifestScanner(self.project_root, self.roots, MANIFEST_NAME, DOC_EXTENSIONS).scan()
+        indexed = dict(self.conn.execute("SELECT path, sha256 FROM docs"))
+        result = {"indexed": 0, "removed": 0, "docs": len(scan["files"])}
+
+        with self.conn:
+            for rel, record in scan["files"].items():
+                if indexed.get(rel) != record["sha256"]:
+                    self._index_doc(rel, record["sha256"])
+                    result["indexed"] += 1
+            for rel in set(indexed) - set(scan["files"]):
+                self._remove_doc(rel)
+                result["removed"] += 1
+
+        if result["indexed"] or result["removed"]:
+            self._lengths = None
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def _doc_lengths(self):
+        if self._lengths is None:
+            self._lengths = {doc_id: length for doc_id, length in self.conn.execute("SELECT id, length FROM docs")}
+        return self._lengths
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """[(score, path, title)] ordenados por BM25"""
+        query_terms = set(terms(query))
+        lengths = self._doc_lengths()
+        if not query_terms or not lengths:
+            return []
+        n_docs = len(lengths)
+        avg_length = sum(lengths.values()) / n_docs
+
+        scores = Counter()
+        for term in query_terms:
+            postings = self.conn.execute("SELECT doc_id, tf FROM postings WHERE term = ?", (term,)).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = K1 * (1 - B + B * lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+
+        best = scores.most_common(limit)
+        if not best:
+            return []
+        placeholders = ",".join("?" * len(best))
+        docs = {doc_id: (path, title) for doc_id, path, title in self.conn.execute(
+            f"SELECT id, path, title FROM docs WHERE id IN ({placeholders})", [doc_id for doc_id, _ in best])}
+        return [(score, *docs[doc_id]) for doc_id, score in best]
+
+
+def snippet(project_root, rel, query, width=100):
+    """Primeira linha de texto (títulos só em último caso) com mais termos da consulta"""
+    wanted = set(terms(query))
+    best, best_rank = None, 0
+    try:
+        with open(os.path.join(project_root, rel), 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                hits = len(wanted.intersection(terms(line)))
+                rank = hits * 2 - line.startswith("#") if hits else 0
+                if rank > best_rank:
+                    best, best_rank = line.strip(), rank
+                    if rank == len(wanted) * 2:
+                        break
+    except OSError:
+        return None
+    if best and len(best) > width:
+        best = best[:width - 1] + "…"
+    return best
+
+
+def run_search(project_root, query, limit=DEFAULT_LIMIT):
+    """Atualiza o índice (incremental) e imprime os documentos mais relevantes"""
+    index = DocsIndex(project_root)
+    try:
+        update = index.update()
+        started = time.perf_counter()
+        results = index.search(query, limit)
+        elapsed = time.perf_counter() - started
+
+        if not results:
+            print(f"🔎 Nenhum documento para: {query}")
+        else:
+            print(f"🔎 {query}: {len(results)} documento(s)")
+        for score, rel, title in results:
+            print(f"\n   📄 {rel}  ({score:.2f})")
+            if title:
+                print(f"      {title}")
+            line = snippet(index.project_root, rel, query)
+            if line:
+                print(f"      … {line}")
+        print(f"\n⏱️  Índice: {update['indexed']} documento(s) reindexado(s) de {update['docs']} "
+              f"em {update['elapsed'] * 1000:.1f} ms | busca: {elapsed * 1000:.2f} ms")
+        return results
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python docs_search.py [raiz_do_projeto] <consulta>")
+        sys.exit(1)
+    root, query = (args[0], " ".join(args[1:])) if len(args) > 1 and os.path.isdir(args[0]) \
+        else ("D:/projetos/desenrola_dcl", " ".join(args))
+    run_search(root, query)
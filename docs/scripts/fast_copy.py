@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cópia de arquivos pelo método mais barato que o sistema de arquivos oferece:
+reflink (clone copy-on-write: btrfs, XFS), copy_file_range e sendfile (cópia dentro do kernel),
+e leitura/escrita comum como último recurso.
+Hardlinks não entram: editores que gravam no próprio arquivo alterariam também o backup
+"""
+
+import os
+import sys
+import errno
+
+CHUNK_SIZE = 1024 * 1024
+FICLONE = 0x40049409   # ioctl do Linux (linux/fs.h)
+
+# Erros que significam "método não suportado aqui" (tenta o próximo)
+UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTTY, errno.EBADF,
+               getattr(errno, "EOPNOTSUPP", errno.ENOSYS), getattr(errno, "ENOTSUP", errno.ENOSYS)}
+
+# (método, dispositivo de origem, dispositivo de destino) que já falharam nesta execução
+_unsupported = set()
+
+
+def _reflink(src_fd, dst_fd, size):
+    import fcntl
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd, dst_fd, size):
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(src_fd, dst_fd, min(size - copied, 1 << 30))
+        if n == 0:
+            if copied == 0:   # alguns sistemas de arquivos (procfs, FUSE) devolvem 0 em vez de erro
+                raise OSError(errno.ENOSYS, "copy_file_range não copiou nada")
+            break
+        copied += n
+
+
+def _sendfile(src_fd, dst_fd, size):
+    copied = 0
+    while copied < size:
+        n = os.sendfile(dst_fd, src_fd, copied, min(size - copied, 1 << 30))
+        if n == 0:
+            break
+        copied += n
+
+
+def _read_write(src_fd, dst_fd, size):
+    while True:
+        chunk = os.read(src_fd, CHUNK_SIZE)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst_fd, view):]
+
+
+def available_methods():
+    """Métodos deste sistema, do mais barato ao mais caro"""
+    methods = []
+    if sys.platform.startswith("linux"):
+        methods.append(("reflink", _reflink))
+    if hasattr(os, "copy_file_range"):
+        methods.append(("copy_file_range", _copy_file_range))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        methods.append(("sendfile", _sendfile))
+    methods.append(("copy", _read_write))
+    return methods
+
+
+METHODS = available_methods()
+
+
+def copy_file(src, dst):
+    """
+    Copia o conteúdo de src para dst (criado ou truncado) e devolve o método usado.
+    Um método que falha como "não suportado" não é tentado de novo entre os mesmos dispositivos
+    """
+    flags = getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o644)
+        try:
+            size = os.fstat(src_fd).st_size
+            devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+            for name, method in METHODS:
+                if (name, *devices) in _unsupported:
+                    continue
+                try:
+                    method(src_fd, dst_fd, size)
+                    return name
+                except OSError as e:
+                    if name == "copy" or e.errno not in UNSUPPORTED:
+                        raise
+                    _unsupported.add((name, *devices))
+                    # Recomeça do zero com o próximo método
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
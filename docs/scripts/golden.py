@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Registro de arquivos canônicos ("golden files") do projeto
+Cada arquivo fica uma única vez em golden/, comprimido (zlib) e com o sha256 do conteúdo
+em golden/registry.json, junto com os trechos que toda versão válida precisa conter.
+Nada é lido na importação: o registro é carregado no primeiro uso e cada conteúdo só é
+descomprimido (e conferido) quando alguém pede por ele
+"""
+
+import json
+import zlib
+import hashlib
+from pathlib import Path
+from functools import lru_cache
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+REGISTRY_NAME = "registry.json"
+RESOURCE_SUFFIX = ".z"
+
+GLOBAL_HEADER = "components/layout/GlobalHeader.tsx"
+
+
+class GoldenError(Exception):
+    pass
+
+
+class GoldenRegistry:
+    def __init__(self, directory=GOLDEN_DIR):
+        self.directory = Path(directory)
+        self._files = None
+        self._contents = {}
+
+    @property
+    def files(self):
+        if self._files is None:
+            try:
+                with open(self.directory / REGISTRY_NAME, 'r', encoding='utf-8') as f:
+                    self._files = json.load(f)["files"]
+            except FileNotFoundError:
+                self._files = {}
+        return self._files
+
+    def names(self):
+        return sorted(self.files)
+
+    def entry(self, rel):
+        try:
+            return self.files[rel]
+        except KeyError:
+            raise GoldenError(f"{rel}: não está no registro de arquivos canônicos") from None
+
+    def checks(self, rel):
+        """[(trecho obrigatório, descrição)]"""
+        return [tuple(check) for check in self.entry(rel)["checks"]]
+
+    def content(self, rel):
+        """Bytes canônicos, descomprimidos e conferidos pelo hash no primeiro uso"""
+        if rel not in self._contents:
+            entry = self.entry(rel)
+            with open(self.directory / entry["resource"], 'rb') as f:
+                data = zlib.decompress(f.read())
+            if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                raise GoldenError(f"{rel}: recurso {entry['resource']} corrompido (hash diferente)")
+            self._contents[rel] = data
+        return self._contents[rel]
+
+    def text(self, rel):
+        return self.content(rel).decode('utf-8')
+
+    def register(self, rel, data, checks=None):
+        """
+        Registra (ou atualiza) um arquivo canônico. Sem checks, mantém os já registrados.
+        O recurso antigo é apagado se nenhum outro arquivo o usa
+        """
+        from atomic_io import atomic_write_bytes
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        previous = self.files.get(rel)
+        resource = f"{Path(rel).name}-{sha256[:12]}{RESOURCE_SUFFIX}"
+        self.directory.mkdir(exist_ok=True)
+        if not (self.directory / resource).exists():
+            atomic_write_bytes(self.directory / resource, zlib.compress(data, 9))
+
+        self.files[rel] = {
+            "resource": resource,
+            "sha256": sha256,
+            "size": len(data),
+            "checks": [list(check) for check in (checks if checks is not None else
+                                                 previous["checks"] if previous else [])],
+        }
+        registry = {"version": 1, "files": dict(sorted(self.files.items()))}
+        atomic_write_bytes(self.directory / REGISTRY_NAME,
+                           (json.dumps(registry, ensure_ascii=False, indent=2) + "\n").encode('utf-8'))
+        self._contents[rel] = data
+
+        if previous and previous["resource"] != resource and \
+                all(other["resource"] != previous["resource"] for other in self.files.values()):
+            (self.directory / previous["resource"]).unlink(missing_ok=True)
+        return self.files[rel]
+
+    def verify(self, project_root, rels=None):
+        """
+        Situação de cada arquivo registrado no projeto: identical (igual ao canônico),
+        ok (editado, mas com todos os trechos obrigatórios), broken ou missing
+        """
+        from atomic_io import encode_text, same_content
+        from matcher import compile_matcher
+
+        results = []
+        for rel in rels or self.names():
+            path = Path(project_root) / rel
+            checks = self.checks(rel)
+            if not path.exists():
+                results.append({"path": rel, "status": "missing", "failed": [d for _, d in checks]})
+                continue
+            canonical = self.content(rel)
+            if same_content(path, canonical) or same_content(path, encode_text(self.text(rel))):
+                results.append({"path": rel, "status": "identical", "failed": []})
+                continue
+            found = compile_matcher([needle for needle, _ in checks]).scan_file(path)["counts"] if checks else {}
+            failed = [description for needle, description in checks if not found[needle]]
+            results.append({"path": rel, "status": "broken" if failed else "ok", "failed": failed})
+        return results
+
+    def restore(self, project_root, rel, repair=False, backup=None):
+        """
+        Grava o conteúdo canônico no projeto (backup(path) antes de sobrescrever).
+        repair=True reaplica só os trechos que cobrem os trechos obrigatórios ausentes,
+        mantendo as edições locais; se isso não bastar, recria o arquivo inteiro
+        """
+        from atomic_io import write_if_changed
+
+        path = Path(project_root) / rel
+        report = None
+        content = self.text(rel)
+        if repair and path.exists():
+            from self_heal import repair as repair_hunks
+            report = repair_hunks(path.read_bytes(), content, self.checks(rel))
+            if report is not None:
+                content = report["content"]
+
+        existed = path.exists()
+        if not write_if_changed(path, content, before_replace=backup):
+            action = "unchanged"
+        elif report is not None:
+            action = "repaired"
+        else:
+            action = "restored" if existed else "created"
+        return {"path": path, "action": action, "repair": report}
+
+
+@lru_cache(maxsize=None)
+def get_registry(directory=GOLDEN_DIR):
+    """Registro compartilhado (carregado só no primeiro acesso)"""
+    return GoldenRegistry(directory)
+
+
+STATUS_ICONS = {"identical": "✅", "ok": "✏️ ", "broken": "❌", "missing": "❓"}
+
+
+def print_verify(results):
+    for result in results:
+        failed = f" (faltando: {', '.join(result['failed'])})" if result["failed"] else ""
+        print(f"{STATUS_ICONS[result['status']]} {result['path']}: {result['status']}{failed}")
+    bad = sum(result["status"] in ("broken", "missing") for result in results)
+    print(f"📊 {len(results)} arquivo(s) canônico(s), {bad} com problema")
+    return not bad
+
+
+if __name__ == "__main__":
+    import sys
+    registry = get_registry()
+    print_verify(registry.verify(sys.argv[1] if len(sys.argv) > 1 else "D:/projetos/desenrola_dcl"))
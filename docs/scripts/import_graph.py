@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Grafo de imports dos módulos de src/ (TS/TSX/JS)
+Extrai imports e exports de cada arquivo (em paralelo), resolve o alias @/ e os caminhos
+relativos, e aponta ciclos de import, módulos órfãos e os mais importados.
+O resultado de cada arquivo fica em cache pelo sha256 do manifesto de integridade:
+depois de editar um arquivo, só ele é analisado de novo
+"""
+
+import os
+import re
+import json
+import time
+from collections import defaultdict
+
+from integrity_scan import ManifestScanner, state_dir, write_json_atomic
+from profiling import span, active, capture
+
+SRC_ROOTS = ("src",)
+CODE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs")
+ALIASES = {"@/": "src/"}   # tsconfig.json: "@/*": ["./src/*"]
+CACHE_NAME = "import_cache.json"
+CACHE_VERSION = 2   # 2: cláusula do import restrita (resultados antigos podiam ter imports falsos)
+BATCHES_PER_WORKER = 4
+TOP_FAN_IN = 15
+
+# Arquivos carregados pelo Next.js sem import explícito (não contam como órfãos)
+ENTRY_POINT = re.compile(
+    r"^src/(?:middleware|instrumentation)\.[jt]sx?$"
+    r"|^src/app/(?:.*/)?(?:page|layout|route|loading|error|global-error|not-found|template|default|"
+    r"sitemap|robots|manifest|icon|opengraph-image)\.[jt]sx?$"
+    r"|\.d\.ts$")
+
+# Padrões que começam por literal (import/export): o re pula direto para as ocorrências,
+# bem mais rápido que ancorar com ^ em cada linha; o início de linha é conferido à parte
+_KEYWORD = re.compile(r"import\b|export\b")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+# Cláusula só com as formas de import/export (nome, * as x, { ... }): sem isso, em código sem ';'
+# a busca pelo "from" atravessava linhas e comentários até o próximo import
+_CLAUSE = r"""(?:[\w$]+|\*(?:\s*as\s+[\w$]+)?|\{[^{}'";]*\})(?:\s*,\s*(?:\*\s*as\s+[\w$]+|\{[^{}'";]*\}))?"""
+_STATIC = re.compile(r"""(?P<kw>import|export)\s+(?P<type>type\s+)?(?P<clause>""" + _CLAUSE
+                     + r""")\s*from\s*['"](?P<spec>[^'"]+)['"]""")
+_SIDE_EFFECT = re.compile(r"""import\s*['"](?P<spec>[^'"]+)['"]""")
+_DYNAMIC = (re.compile(r"""import\s*\(\s*['"](?P<spec>[^'"]+)['"]\s*\)"""),
+            re.compile(r"""require\s*\(\s*['"](?P<spec>[^'"]+)['"]\s*\)"""))
+_EXPORT_DECL = re.compile(r"export\s+(?:declare\s+)?(?P<default>default\s+)?(?:async\s+)?(?:abstract\s+)?"
+                          r"(?:function\*?|class|const|let|var|interface|type|enum)\s+(?P<name>[\w$]+)")
+_EXPORT_DEFAULT = re.compile(r"export\s+default\b")
+_EXPORT_LIST = re.compile(r"export\s+(?:type\s+)?\{(?P<names>[^}]*)\}(?!\s*from\b)")
+
+
+def _named(clause):
+    """Nomes dentro de { ... } (com 'x as y' vale o y)"""
+    names = []
+    for item in clause.split(","):
+        item = item.strip()
+        if item:
+            names.append(item.split(" as ")[-1].strip())
+    return names
+
+
+def _statement_starts(text):
+    """Posições de import/export no início de uma linha e fora de comentários /* */"""
+    comments = [(m.start(), m.end()) for m in _BLOCK_COMMENT.finditer(text)]
+    comment = 0
+    for match in _KEYWORD.finditer(text):
+        position = match.start()
+        while comment < len(comments) and comments[comment][1] <= position:
+            comment += 1
+        if comment < len(comments) and comments[comment][0] <= position:
+            continue
+        line_start = text.rfind("\n", 0, position) + 1
+        if text[line_start:position].strip(" \t"):
+            continue
+        yield position
+
+
+def parse_module(text):
+    """
+    {"imports": [[especificador, tipo]], "exports": [nomes]}.
+    tipo: value, type (só tipos, some na compilação), side (import 'x'), dynamic (import()/require())
+    """
+    imports, exports = [], []
+
+    for position in _statement_starts(text):
+        match = _STATIC.match(text, position)
+        if match:
+            clause = match.group("clause")
+            kind = "type" if match.group("type") else "value"
+            if kind == "value" and "{" in clause and not clause.split("{")[0].strip(" ,"):
+                items = [item.strip() for item in clause.strip("{} \n").split(",") if item.strip()]
+                if items and all(item.startswith("type ") for item in items):
+                    kind = "type"
+            imports.append([match.group("spec"), kind])
+            if match.group("kw") == "export":
+                exports.extend(["*"] if clause.strip().startswith("*") and " as " not in clause
+                               else _named(clause.strip("{} \n").replace("* as ", "")))
+            continue
+        match = _SIDE_EFFECT.match(text, position)
+        if match:
+            imports.append([match.group("spec"), "side"])
+            continue
+        match = _EXPORT_DECL.match(text, position)
+        if match:
+            exports.append("default" if match.group("default") else match.group("name"))
+            continue
+        match = _EXPORT_LIST.match(text, position)
+        if match:
+            exports.extend(_named(match.group("names")))
+        elif _EXPORT_DEFAULT.match(text, position):
+            exports.append("default")
+
+    for pattern in _DYNAMIC:
+        imports.extend([match.group("spec"), "dynamic"] for match in pattern.finditer(text))
+    return {"imports": imports, "exports": sorted(set(exports))}
+
+
+def _parse_batch(batch):
+    """Analisa um lote de arquivos; com perfil ativo devolve também os spans do lote"""
+    project_root, rel_paths, profile = batch
+
+    def parse_all():
+        parsed = []
+        for rel in rel_paths:
+            with span("read", rel) as s:
+                with open(os.path.join(project_root, rel), 'rb') as f:
+                    data = f.read()
+                s.nbytes = len(data)
+            with span("parse", rel):
+                parsed.append((rel, parse_module(data.decode('utf-8', errors='replace'))))
+        return parsed
+
+    if not profile:
+        return parse_all(), None
+    with capture() as profiler:
+        parsed = parse_all()
+    return parsed, profiler.export()
+
+
+def resolve(spec, importer, known):
+    """Caminho relativo do módulo importado (None = pacote externo, '' = não encontrado)"""
+    for alias, target in ALIASES.items():
+        if spec.startswith(alias):
+            base = target + spec[len(alias):]
+            break
+    else:
+        if not spec.startswith("."):
+            return None
+        base = os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, '/')
+
+    candidates = [base] + [base + ext for ext in CODE_EXTENSIONS] + [f"{base}/index{ext}" for ext in CODE_EXTENSIONS]
+    return next((candidate for candidate in candidates if candidate in known), "")
+
+
+def strongly_connected(graph):
+    """Componentes fortemente conexos (Tarjan, iterativo para não estourar a recursão)"""
+    index, low, on_stack = {}, {}, set()
+    stack, components, counter = [], [], 0
+
+    for start in graph:
+        if start in index:
+            continue
+        work = [(start, iter(graph[start]))]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, neighbours = work[-1]
+            for neighbour in neighbours:
+                if neighbour not in index:
+                    index[neighbour] = low[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack.add(neighbour)
+                    work.append((neighbour, iter(graph.get(neighbour, ()))))
+                    break
+                if neighbour in on_stack:
+                    low[node] = min(low[node], index[neighbour])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+class ImportGraph:
+    def __init__(self, project_root, roots=SRC_ROOTS):
+        self.project_root = os.path.abspath(project_root)
+        self.roots = tuple(roots)
+        self.cache_path = state_dir(self.project_root) / CACHE_NAME
+        self.modules = {}   # caminho -> {"imports": [...], "exports": [...]}
+        self.edges = {}     # caminho -> {importado: tipo}
+        self.unresolved = []
+        self.external = defaultdict(int)
+
+    def _load_cache(self):
+        if self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                return data["entries"]
+        return {}
+
+    def build(self, workers=None):
+        """Atualiza o manifesto, analisa só os arquivos com hash fora do cache e monta o grafo"""
+        from parallel import default_workers, make_batches, iter_parallel
+
+        started = time.perf_counter()
+        with span("scan"):
+            scan = ManifestScanner(self.project_root, self.roots).scan()
+        files = scan["files"]
+        code = {rel: record for rel, record in files.items() if rel.endswith(CODE_EXTENSIONS)}
+        cache = self._load_cache()
+        pending = [(rel, record["size"]) for rel, record in code.items() if record["sha256"] not in cache]
+
+        workers = workers or default_workers()
+        profiler = active()
+        batches = make_batches(pending, workers * BATCHES_PER_WORKER, weight=lambda item: item[1])
+        batches = [(self.project_root, [rel for rel, _ in batch], profiler is not None) for batch in batches]
+        for parsed, profile in iter_parallel(_parse_batch, batches, workers):
+            if profile:
+                profiler.merge(profile)
+            for rel, module in parsed:
+                cache[code[rel]["sha256"]] = module
+
+        live = {record["sha256"] for record in code.values()}
+        if pending or len(cache) != len(live):
+            write_json_atomic(self.cache_path, {"version": CACHE_VERSION,
+                                                "entries": {sha: cache[sha] for sha in live}})
+
+        with span("resolve"):
+            self.modules = {rel: cache[record["sha256"]] for rel, record in code.items()}
+            for rel, module in self.modules.items():
+                targets = {}
+                for spec, kind in module["imports"]:
+                    target = resolve(spec, rel, files)
+                    if target is None:
+                        self.external[spec.split("/")[0] if not spec.startswith("@") else "/".join(spec.split("/")[:2])] += 1
+                    elif not target:
+                        self.unresolved.append((rel, spec))
+                    elif target in self.modules and target != rel:
+                        # Um import de valor prevalece sobre um só de tipos para o mesmo módulo
+                        if targets.get(target) in (None, "type"):
+                            targets[target] = kind
+                self.edges[rel] = targets
+
+        return {"files": len(code), "parsed": len(pending), "elapsed": time.perf_counter() - started}
+
+    def cycles(self):
+        """Ciclos de import em tempo de execução (imports só de tipos são apagados pelo TypeScript)"""
+        runtime = {rel: [target for target, kind in targets.items() if kind != "type"]
+                   for rel, targets in self.edges.items()}
+        with span("cycles"):
+            components = [sorted(c) for c in strongly_connected(runtime) if len(c) > 1]
+        return sorted(components, key=lambda c: (-len(c), c))
+
+    def fan_in(self):
+        importers = defaultdict(list)
+        for rel, targets in self.edges.items():
+            for target in targets:
+                importers[target].append(rel)
+        return importers
+
+    def orphans(self):
+        """Módulos que ninguém importa e que não são pontos de entrada do Next.js"""
+        importers = self.fan_in()
+        return sorted(rel for rel in self.modules if not importers.get(rel) and not ENTRY_POINT.search(rel))
+
+    def report(self, top=TOP_FAN_IN):
+        importers = self.fan_in()
+        hotspots = sorted(importers.items(), key=lambda item: (-len(item[1]), item[0]))[:top]
+        return {
+            "modules": len(self.modules),
+            "edges": sum(len(targets) for targets in self.edges.values()),
+            "cycles": self.cycles(),
+            "orphans": self.orphans(),
+            "fan_in": [{"module": rel, "importers": len(users)} for rel, users in hotspots],
+            "unresolved": [{"file": rel, "import": spec} for rel, spec in self.unresolved],
+            "external": dict(sorted(self.external.items(), key=lambda item: -item[1])),
+        }
+
+
+def run_import_graph(project_root, top=TOP_FAN_IN, as_json=False, workers=None):
+    """Monta o grafo e imprime ciclos, órfãos, imports quebrados e os módulos mais importados"""
+    graph = ImportGraph(project_root)
+    build = graph.build(workers)
+    report = graph.report(top)
+
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return report
+
+    print(f"📦 Módulos: {report['modules']} | 🔗 Imports internos: {report['edges']} | "
+          f"📚 Pacotes externos: {len(report['external'])}")
+    print(f"🔄 Analisados: {build['parsed']} de {build['files']} em {build['elapsed'] * 1000:.1f} ms")
+
+    print(f"\n🔁 Ciclos de import: {len(report['cycles'])}")
+    for number, cycle in enumerate(report["cycles"], 1):
+        print(f"   {number}. {len(cycle)} módulos")
+        for rel in cycle:
+            print(f"      ↪ {rel}")
+
+    if report["unresolved"]:
+        print(f"\n❌ Imports não resolvidos: {len(report['unresolved'])}")
+        for item in report["unresolved"]:
+            print(f"   {item['file']}: {item['import']}")
+
+    print(f"\n🔥 Mais importados:")
+    for item in report["fan_in"]:
+        print(f"   {item['importers']:>4}  {item['module']}")
+
+    print(f"\n👻 Órfãos (ninguém importa): {len(report['orphans'])}")
+    for rel in report["orphans"]:
+        print(f"   {rel}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    run_import_graph(args[0] if args else "D:/projetos/desenrola_dcl", as_json="--json" in sys.argv)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Varredura incremental de integridade de todos os arquivos do projeto
+Mantém um manifesto persistido (mtime_ns, tamanho, hash) e só relê arquivos cujo stat mudou
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from profiling import span
+
+STATE_DIRNAME = ".desenrola"
+IGNORED_DIRS = {"node_modules", ".next", ".git", "__pycache__", STATE_DIRNAME, "backups"}
+TEXT_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".css", ".json", ".md", ".sql", ".txt"}
+
+
+def state_dir(project_root):
+    """Diretório de estado das ferramentas (manifestos, índices, caches)"""
+    path = Path(project_root) / STATE_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_json_atomic(path, data):
+    """Grava JSON num temporário e renomeia por cima do destino"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def iter_files(base_dir, extensions=None):
+    """Percorre recursivamente um diretório com os.scandir, devolvendo (DirEntry, stat)"""
+    stack = [str(base_dir)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if extensions and os.path.splitext(entry.name)[1] not in extensions:
+                            continue
+                        yield entry, entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+
+
+def check_content(data, suffix):
+    """Problemas de integridade detectáveis só pelo conteúdo"""
+    issues = []
+    if not data:
+        issues.append("arquivo vazio")
+    elif suffix in TEXT_EXTENSIONS:
+        if b"\x00" in data:
+            issues.append("bytes nulos (arquivo corrompido?)")
+        try:
+            data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            issues.append(f"UTF-8 inválido na posição {e.start}")
+    return issues
+
+
+class ManifestScanner:
+    def __init__(self, project_root, roots=("src",), manifest_name="manifest.json", extensions=None):
+        self.project_root = Path(project_root).absolute()
+        self.roots = tuple(roots)
+        self.extensions = set(extensions) if extensions else None
+        self.manifest_path = state_dir(self.project_root) / manifest_name
+        self.files = {}
+
+    def load(self):
+        """Carrega o manifesto persistido (vazio se ainda não existir)"""
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("roots") == list(self.roots):
+                self.files = data.get("files", {})
+        return self.files
+
+    def save(self):
+        """Persiste o manifesto"""
+        write_json_atomic(self.manifest_path, {"version": 1, "roots": list(self.roots), "files": self.files})
+
+    def scan(self):
+        """
+        Varre as raízes comparando stat com o manifesto.
+        Arquivos com mtime_ns e tamanho iguais não são abertos
+        """
+        started = time.perf_counter()
+        previous = self.load()
+        current = {}
+        result = {"added": [], "modified": [], "removed": [], "rehashed": 0, "bytes_read": 0}
+
+        root_prefix = len(str(self.project_root)) + 1
+        for root in self.roots:
+            base_dir = self.project_root / root
+            if not base_dir.is_dir():
+                continue
+            for entry, st in iter_files(base_dir, self.extensions):
+                rel = entry.path[root_prefix:].replace(os.sep, '/')
+                old = previous.get(rel)
+                if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                    current[rel] = old
+                    continue
+
+                with span("read", rel) as s:
+                    with open(entry.path, 'rb') as f:
+                        data = f.read()
+                    s.nbytes = len(data)
+                result["rehashed"] += 1
+                result["bytes_read"] += len(data)
+                with span("hash", rel):
+                    sha256 = hashlib.sha256(data).hexdigest()
+                with span("check", rel):
+                    issues = check_content(data, os.path.splitext(rel)[1])
+                record = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "sha256": sha256,
+                    "issues": issues,
+                }
+                current[rel] = record
+                if old is None:
+                    result["added"].append(rel)
+                elif old["sha256"] != record["sha256"]:
+                    result["modified"].append(rel)
+
+        result["removed"] = sorted(set(previous) - set(current))
+        changed = result["rehashed"] or result["removed"] or not self.manifest_path.exists()
+        self.files = current
+        if changed:
+            with span("write"):
+                self.save()
+
+        result["files"] = current
+        result["issues"] = {rel: rec["issues"] for rel, rec in current.items() if rec["issues"]}
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+
+def scan_project(project_root, roots=("src",)):
+    """Executa a varredura e imprime o relatório"""
+    result = ManifestScanner(project_root, roots).scan()
+
+    print(f"📁 Arquivos verificados: {len(result['files'])}")
+    print(f"🔄 Relidos: {result['rehashed']} ({result['bytes_read']} bytes)")
+    print(f"🆕 Novos: {len(result['added'])} | ✏️  Alterados: {len(result['modified'])} | 🗑️  Removidos: {len(result['removed'])}")
+    for rel in result['modified']:
+        print(f"   ✏️  {rel}")
+    for rel in result['removed']:
+        print(f"   🗑️  {rel}")
+
+    if result['issues']:
+        print(f"❌ Problemas encontrados em {len(result['issues'])} arquivo(s):")
+        for rel, issues in sorted(result['issues'].items()):
+            print(f"   📄 {rel}: {', '.join(issues)}")
+    else:
+        print("✅ Nenhum problema de integridade encontrado")
+
+    print(f"⏱️  Tempo: {result['elapsed'] * 1000:.1f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+    scan_project(sys.argv[1] if len(sys.argv) > 1 else "D:/projetos/desenrola_dcl")
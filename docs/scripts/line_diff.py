@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Diff por linhas quase linear (patience + Myers), no lugar do difflib em arquivos grandes
+Cada linha vira um inteiro (hash por dicionário); linhas únicas nos dois lados ancoram o
+alinhamento (maior subsequência crescente) e só os trechos entre âncoras sem linha única
+passam pelo Myers, com limite de custo. Saída em diff unificado ou JSON
+"""
+
+from bisect import bisect_left
+from collections import Counter
+
+CONTEXT = 3
+MYERS_MAX_D = 400   # acima disso o trecho vira uma troca inteira (evita o caso quadrático)
+
+
+def _intern(a_lines, b_lines):
+    table = {}
+    a = [table.setdefault(line, len(table)) for line in a_lines]
+    b = [table.setdefault(line, len(table)) for line in b_lines]
+    return a, b
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi):
+    """Pares (i, j) de linhas que aparecem uma única vez em cada lado, na maior sequência crescente"""
+    count_a = Counter(a[alo:ahi])
+    count_b = Counter(b[blo:bhi])
+    position = {a[i]: i for i in range(alo, ahi) if count_a[a[i]] == 1}
+    pairs = [(position[b[j]], j) for j in range(blo, bhi) if count_b[b[j]] == 1 and b[j] in position]
+    if not pairs:
+        return []
+
+    # Patience sorting: pilhas pelo índice em a, com ponteiro para a pilha anterior
+    tops, links = [], []
+    for index, (i, _) in enumerate(pairs):
+        pile = bisect_left(tops, i)
+        if pile == len(tops):
+            tops.append(i)
+        else:
+            tops[pile] = i
+        links.append((pile, index))
+    lis, wanted = [], len(tops) - 1
+    previous_i = None
+    for pile, index in reversed(links):
+        if pile == wanted and (previous_i is None or pairs[index][0] < previous_i):
+            lis.append(pairs[index])
+            previous_i = pairs[index][0]
+            wanted -= 1
+    lis.reverse()
+    return lis
+
+
+def _myers(a, b, alo, ahi, blo, bhi, max_d=MYERS_MAX_D):
+    """Pares iguais do menor script de edição (Myers O(ND)); None se D passar do limite"""
+    n, m = ahi - alo, bhi - blo
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_d) + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m, alo, blo)
+    return None
+
+
+def _backtrack(trace, x, y, alo, blo):
+    pairs = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            pairs.append((alo + x, blo + y))
+        if d > 0:
+            x, y = previous_x, previous_y
+    return pairs
+
+
+def matching_pairs(a, b):
+    """Índices (i, j) de linhas casadas, em ordem"""
+    pairs = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            pairs.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            pairs.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            previous_a, previous_b = alo, blo
+            for i, j in anchors:
+                stack.append((previous_a, i, previous_b, j))
+                pairs.append((i, j))
+                previous_a, previous_b = i + 1, j + 1
+            stack.append((previous_a, ahi, previous_b, bhi))
+        else:
+            pairs.extend(_myers(a, b, alo, ahi, blo, bhi) or ())
+    pairs.sort()
+    return pairs
+
+
+def diff_lines(a_lines, b_lines):
+    """Operações no formato do difflib: (tag, i1, i2, j1, j2) com equal/replace/delete/insert"""
+    a, b = _intern(a_lines, b_lines)
+    opcodes = []
+    i = j = 0
+    pairs = matching_pairs(a, b)
+    index = 0
+    while index <= len(pairs):
+        if index < len(pairs):
+            start_i, start_j = pairs[index]
+            size = 1
+            while index + size < len(pairs) and pairs[index + size] == (start_i + size, start_j + size):
+                size += 1
+        else:
+            start_i, start_j, size = len(a), len(b), 0
+        if i < start_i and j < start_j:
+            opcodes.append(("replace", i, start_i, j, start_j))
+        elif i < start_i:
+            opcodes.append(("delete", i, start_i, j, j))
+        elif j < start_j:
+            opcodes.append(("insert", i, i, j, start_j))
+        if size:
+            opcodes.append(("equal", start_i, start_i + size, start_j, start_j + size))
+        i, j = start_i + size, start_j + size
+        index += size or 1
+    return opcodes
+
+
+def grouped_opcodes(opcodes, context=CONTEXT):
+    """Blocos de alterações com `context` linhas iguais em volta (como difflib.get_grouped_opcodes)"""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _range(start, length):
+    if length == 1:
+        return str(start + 1)
+    return f"{start if not length else start + 1},{length}"
+
+
+def _text(line):
+    return line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line
+
+
+def hunks(a_lines, b_lines, context=CONTEXT, opcodes=None):
+    """[{a_start, a_lines, b_start, b_lines, lines: [' x', '-y', '+z']}] (linhas com o \\n original)"""
+    opcodes = diff_lines(a_lines, b_lines) if opcodes is None else opcodes
+    result = []
+    for group in grouped_opcodes(opcodes, context):
+        first, last = group[0], group[-1]
+        hunk = {"a_start": first[1], "a_lines": last[2] - first[1],
+                "b_start": first[3], "b_lines": last[4] - first[3], "lines": []}
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                hunk["lines"].extend(" " + _text(line) for line in a_lines[i1:i2])
+                continue
+            hunk["lines"].extend("-" + _text(line) for line in a_lines[i1:i2])
+            hunk["lines"].extend("+" + _text(line) for line in b_lines[j1:j2])
+        result.append(hunk)
+    return result
+
+
+def unified(a_lines, b_lines, a_label="a", b_label="b", context=CONTEXT, opcodes=None):
+    """Diff unificado (texto), vazio se não houver diferenças"""
+    out = []
+    for hunk in hunks(a_lines, b_lines, context, opcodes):
+        if not out:
+            out += [f"--- {a_label}\n", f"+++ {b_label}\n"]
+        out.append(f"@@ -{_range(hunk['a_start'], hunk['a_lines'])} "
+                   f"+{_range(hunk['b_start'], hunk['b_lines'])} @@\n")
+        for line in hunk["lines"]:
+            if line.endswith("\n"):
+                out.append(line)
+            else:
+                out.append(line.rstrip("\r") + "\n\\ No newline at end of file\n")
+    return "".join(out)
+
+
+def diff_stats(opcodes):
+    """(linhas adicionadas, linhas removidas)"""
+    added = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag in ("insert", "replace"))
+    removed = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag in ("delete", "replace"))
+    return added, removed
+
+
+def diff_json(a_lines, b_lines, a_label="a", b_label="b", context=CONTEXT):
+    opcodes = diff_lines(a_lines, b_lines)
+    added, removed = diff_stats(opcodes)
+    return {"a": a_label, "b": b_label, "added": added, "removed": removed,
+            "hunks": hunks(a_lines, b_lines, context, opcodes)}
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Uso: python line_diff.py <antigo> <novo>")
+        sys.exit(2)
+    with open(sys.argv[1], 'rb') as f:
+        old = f.read().splitlines(keepends=True)
+    with open(sys.argv[2], 'rb') as f:
+        new = f.read().splitlines(keepends=True)
+    text = unified(old, new, sys.argv[1], sys.argv[2])
+    sys.stdout.write(text)
+    sys.exit(1 if text else 0)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Detecção de quase-duplicatas em database/, docs/ e src/ (MinHash + LSH)
+Cada arquivo vira um conjunto de shingles (janelas de tokens, por comando no caso do SQL),
+resumido numa assinatura MinHash; só arquivos que caem no mesmo balde LSH são comparados.
+Assinaturas ficam em .desenrola/minhash.json e só são recalculadas para arquivos alterados
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+
+from integrity_scan import state_dir, iter_files, write_json_atomic
+from sql_index import iter_statements
+from profiling import span
+
+DEFAULT_ROOTS = ("database", "docs", "src")
+EXTENSIONS = {".sql", ".md", ".ts", ".tsx"}
+CACHE_NAME = "minhash.json"
+
+SHINGLE_SIZE = 5       # tokens por shingle
+NUM_BINS = 128         # tamanho da assinatura
+LSH_ROWS = (8, 4, 2)   # valores por faixa LSH (faixas = NUM_BINS / linhas)
+MIN_SHINGLES = 20      # arquivos menores que isso geram falsos positivos
+DEFAULT_THRESHOLD = 0.6
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_EMPTY = (1 << 64) - 1
+
+
+def shingle_texts(text, suffix):
+    """Textos dos shingles; no SQL as janelas não atravessam o limite entre comandos"""
+    if suffix == ".sql":
+        units = [statement for _, statement in iter_statements(text)]
+    else:
+        units = [text]
+    for unit in units:
+        tokens = _TOKEN.findall(unit.lower())
+        if len(tokens) <= SHINGLE_SIZE:
+            if tokens:
+                yield " ".join(tokens)
+            continue
+        for i in range(len(tokens) - SHINGLE_SIZE + 1):
+            yield " ".join(tokens[i:i + SHINGLE_SIZE])
+
+
+def signature(shingles):
+    """
+    MinHash de uma permutação só (one-permutation hashing): o hash de cada shingle
+    escolhe uma posição e fica o menor valor de cada posição. Posições vazias são
+    preenchidas pela próxima ocupada (densificação), como sugere o artigo original
+    """
+    bins = [_EMPTY] * NUM_BINS
+    count = 0
+    for value in set(shingles):
+        h = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+        index, rest = h % NUM_BINS, h // NUM_BINS
+        if rest < bins[index]:
+            bins[index] = rest
+        count += 1
+    if count and _EMPTY in bins:
+        filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+        for i in range(NUM_BINS):
+            if bins[i] == _EMPTY:
+                donor = next((j for j in filled if j > i), filled[0])
+                bins[i] = bins[donor] ^ (i * 0x9E3779B97F4A7C15 & _EMPTY)   # distingue a cópia da original
+    return bins, count
+
+
+def similarity(sig_a, sig_b):
+    """Estimativa de Jaccard: fração das posições iguais"""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_BINS
+
+
+def lsh_layout(threshold):
+    """
+    (faixas, linhas) cujo limiar efetivo (1/faixas)^(1/linhas) fica abaixo do pedido,
+    para que pares no limite ainda caiam no mesmo balde com alta probabilidade
+    """
+    for rows in LSH_ROWS:
+        bands = NUM_BINS // rows
+        if (1 / bands) ** (1 / rows) <= threshold - 0.1:
+            return bands, rows
+    return NUM_BINS // LSH_ROWS[-1], LSH_ROWS[-1]
+
+
+class DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+class NearDuplicateFinder:
+    def __init__(self, project_root, roots=DEFAULT_ROOTS, threshold=DEFAULT_THRESHOLD):
+        self.project_root = Path(project_root).absolute()
+        self.roots = tuple(roots)
+        self.threshold = threshold
+        self.cache_path = state_dir(self.project_root) / CACHE_NAME
+        self.signatures = {}
+
+    def _load_cache(self):
+        if self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("params") == [SHINGLE_SIZE, NUM_BINS]:
+                return data["files"]
+        return {}
+
+    def collect(self):
+        """Assinaturas de todos os arquivos (recalcula só os que mudaram de mtime_ns/tamanho)"""
+        cached = self._load_cache()
+        scanned = tuple(root.strip('/') + '/' for root in self.roots)
+        # Entradas de pastas fora desta execução continuam no cache
+        kept = {rel: record for rel, record in cached.items() if not rel.startswith(scanned)}
+        current, result = {}, {"files": 0, "computed": 0, "skipped": 0}
+        prefix = len(str(self.project_root)) + 1
+
+        for root in self.roots:
+            base_dir = self.project_root / root
+            if not base_dir.is_dir():
+                continue
+            for entry, st in iter_files(base_dir, EXTENSIONS):
+                rel = entry.path[prefix:].replace(os.sep, '/')
+                old = cached.get(rel)
+                if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                    current[rel] = old
+                    continue
+                with span("read", rel) as s:
+                    with open(entry.path, 'rb') as f:
+                        data = f.read()
+                    s.nbytes = len(data)
+                with span("minhash", rel):
+                    sig, count = signature(shingle_texts(data.decode('utf-8', errors='replace'),
+                                                         os.path.splitext(rel)[1]))
+                current[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "shingles": count, "sig": sig}
+                result["computed"] += 1
+
+        if result["computed"] or len(kept) + len(current) != len(cached):
+            write_json_atomic(self.cache_path, {"params": [SHINGLE_SIZE, NUM_BINS], "files": dict(kept, **current)})
+
+        self.signatures = {}
+        for rel, record in current.items():
+            if record["shingles"] >= MIN_SHINGLES:
+                self.signatures[rel] = record["sig"]
+            else:
+                result["skipped"] += 1
+        result["files"] = len(current)
+        return result
+
+    def candidate_pairs(self):
+        """Pares que dividem ao menos uma faixa LSH (sem comparar todos contra todos)"""
+        bands, rows = lsh_layout(self.threshold)
+        pairs = set()
+        for band in range(bands):
+            buckets = defaultdict(list)
+            start = band * rows
+            for rel, sig in self.signatures.items():
+                buckets[tuple(sig[start:start + rows])].append(rel)
+            for members in buckets.values():
+                if len(members) > 1:
+                    members.sort()
+                    for i, a in enumerate(members):
+                        for b in members[i + 1:]:
+                            pairs.add((a, b))
+        return pairs
+
+    def clusters(self):
+        """Grupos de arquivos ligados por pares com similaridade >= limiar"""
+        with span("lsh"):
+            pairs = self.candidate_pairs()
+        groups = DisjointSet()
+        scores = {}
+        with span("compare"):
+            for a, b in pairs:
+                score = similarity(self.signatures[a], self.signatures[b])
+                if score >= self.threshold:
+                    scores[(a, b)] = score
+                    groups.union(a, b)
+
+        members = defaultdict(list)
+        for a, b in scores:
+            for rel in (a, b):
+                members[groups.find(rel)].append(rel)
+
+        result = []
+        for files in members.values():
+            files = sorted(set(files))
+            pair_scores = [score for (a, b), score in scores.items() if a in files and b in files]
+            result.append({
+                "files": files,
+                "min_similarity": min(pair_scores),
+                "max_similarity": max(pair_scores),
+                "pairs": sorted(([a, b, round(score, 3)] for (a, b), score in scores.items()
+                                 if a in files), key=lambda pair: -pair[2]),
+            })
+        result.sort(key=lambda cluster: (-cluster["max_similarity"], -len(cluster["files"])))
+        return result, len(pairs)
+
+
+def find_near_duplicates(project_root, roots=DEFAULT_ROOTS, threshold=DEFAULT_THRESHOLD, as_json=False):
+    """Calcula os grupos de quase-duplicatas e imprime o relatório"""
+    started = time.perf_counter()
+    finder = NearDuplicateFinder(project_root, roots, threshold)
+    collected = finder.collect()
+    clusters, candidates = finder.clusters()
+    elapsed = time.perf_counter() - started
+
+    if as_json:
+        print(json.dumps({"clusters": clusters, "files": collected["files"], "candidates": candidates},
+                         ensure_ascii=False, indent=2))
+        return clusters
+
+    n = len(finder.signatures)
+    print(f"📁 Arquivos: {collected['files']} ({collected['computed']} assinatura(s) recalculada(s), "
+          f"{collected['skipped']} pequeno(s) demais)")
+    print(f"🔗 Pares candidatos (LSH): {candidates} de {n * (n - 1) // 2} possíveis")
+    if not clusters:
+        print(f"✅ Nenhum grupo com similaridade >= {threshold:.0%}")
+    for number, cluster in enumerate(clusters, 1):
+        low, high = cluster["min_similarity"], cluster["max_similarity"]
+        score = f"{high:.0%}" if low == high else f"{low:.0%}–{high:.0%}"
+        print(f"\n🧬 Grupo {number}: {len(cluster['files'])} arquivos, similaridade {score}")
+        for rel in cluster["files"]:
+            print(f"   📄 {rel}")
+    print(f"\n⏱️  Tempo: {elapsed * 1000:.1f} ms")
+    return clusters
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    threshold = next((float(a.split("=", 1)[1]) for a in sys.argv if a.startswith("--threshold=")),
+                     DEFAULT_THRESHOLD)
+    find_near_duplicates(args[0] if args else "D:/projetos/desenrola_dcl", threshold=threshold,
+                         as_json="--json" in sys.argv)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Execução paralela em pool de processos para as varreduras do projeto
+Distribui lotes balanceados por tamanho e devolve resultados conforme terminam
+"""
+
+import os
+import heapq
+
+
+def default_workers():
+    """Número de processos padrão (um por núcleo)"""
+    return os.cpu_count() or 1
+
+
+def make_batches(items, n_batches, weight=None):
+    """
+    Divide itens em lotes com peso total parecido (maior primeiro, lote mais leve recebe).
+    Lotes equilibrados evitam que um único processo fique com todos os arquivos grandes
+    """
+    items = list(items)
+    n_batches = max(1, min(n_batches, len(items)))
+    weight = weight or (lambda item: 1)
+
+    heap = [(0, i) for i in range(n_batches)]
+    batches = [[] for _ in range(n_batches)]
+    for item in sorted(items, key=weight, reverse=True):
+        load, i = heapq.heappop(heap)
+        batches[i].append(item)
+        heapq.heappush(heap, (load + max(1, weight(item)), i))
+    return [batch for batch in batches if batch]
+
+
+def iter_parallel(func, batches, workers=None, initializer=None, initargs=()):
+    """Executa func(lote) para cada lote e devolve os resultados na ordem em que terminam"""
+    workers = workers or default_workers()
+
+    if workers <= 1 or len(batches) <= 1:
+        # Sem ganho em criar processos: executa no próprio processo
+        if initializer:
+            initializer(*initargs)
+        for batch in batches:
+            yield func(batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        futures = [executor.submit(func, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Medição de tempo por etapa (spans aninhados: read, match, hash, copy, write...)
+Sem um perfil ativo, span() devolve um contexto vazio e o custo é desprezível.
+Com --profile, cada execução imprime um resumo e grava JSON em .desenrola/profiles/
+"""
+
+import time
+from functools import wraps
+
+TOP_FILES = 10
+
+_active = None
+
+
+class _NullSpan:
+    """Span usado quando não há perfil ativo (atributos aceitos e ignorados)"""
+    __slots__ = ("nbytes",)
+
+    def __init__(self):
+        self.nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "path", "nbytes", "key", "owner", "children", "start")
+
+    def __init__(self, profiler, name, path, nbytes):
+        self.profiler = profiler
+        self.name = name
+        self.path = path
+        self.nbytes = nbytes
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        parent = stack[-1] if stack else None
+        self.key = (parent.key if parent else ()) + (self.name,)
+        # O tempo de um arquivo é o do span mais externo que o menciona
+        self.owner = parent.owner if parent and parent.owner else (self if self.path is not None else None)
+        self.children = 0.0
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler.stack.pop()
+        if profiler.stack:
+            profiler.stack[-1].children += elapsed
+        profiler._record(self.key, 1, elapsed, self.children, self.nbytes)
+        if self.owner is not None:
+            record = profiler.files.setdefault(str(self.owner.path), [0.0, 0])
+            record[1] += self.nbytes
+            if self.owner is self:
+                record[0] += elapsed
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        self.nodes = {}   # caminho de nomes -> [chamadas, total, filhos, bytes]
+        self.files = {}   # arquivo -> [segundos, bytes]
+        self.stack = []
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def _record(self, key, calls, total, children, nbytes):
+        node = self.nodes.get(key)
+        if node is None:
+            self.nodes[key] = [calls, total, children, nbytes]
+        else:
+            node[0] += calls
+            node[1] += total
+            node[2] += children
+            node[3] += nbytes
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def export(self):
+        """Spans e arquivos em formato serializável (para juntar resultados de subprocessos)"""
+        return {"nodes": [[list(key)] + values for key, values in self.nodes.items()],
+                "files": self.files}
+
+    def merge(self, data):
+        """Incorpora o perfil de um subprocesso sob o span atual"""
+        parent = self.stack[-1] if self.stack else None
+        prefix = parent.key if parent else ()
+        for key, calls, total, children, nbytes in data["nodes"]:
+            self._record(prefix + tuple(key), calls, total, children, nbytes)
+            if parent is not None and len(key) == 1:
+                parent.children += total
+        for path, (seconds, nbytes) in data["files"].items():
+            record = self.files.setdefault(path, [0.0, 0])
+            record[0] += seconds
+            record[1] += nbytes
+
+    def summary(self, top=TOP_FILES):
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.started
+        total_bytes = sum(node[3] for node in self.nodes.values())
+        spans = []
+        for key in sorted(self.nodes):
+            calls, total, children, nbytes = self.nodes[key]
+            spans.append({"span": "/".join(key), "depth": len(key) - 1, "calls": calls,
+                          "total_ms": round(total * 1000, 3), "self_ms": round(max(total - children, 0.0) * 1000, 3),
+                          "bytes": nbytes})
+        slowest = sorted(self.files.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "files": len(self.files),
+            "bytes": total_bytes,
+            "files_per_sec": round(len(self.files) / elapsed, 1) if elapsed else 0.0,
+            "bytes_per_sec": round(total_bytes / elapsed, 1) if elapsed else 0.0,
+            "spans": spans,
+            "slowest_files": [{"path": path, "ms": round(seconds * 1000, 3), "bytes": nbytes}
+                              for path, (seconds, nbytes) in slowest],
+        }
+
+
+def active():
+    """Perfil em andamento (None se não houver)"""
+    return _active
+
+
+def span(name, path=None, nbytes=0):
+    """Mede um trecho; `path` associa o tempo a um arquivo, `nbytes` conta o volume lido/gravado"""
+    if _active is None:
+        return _NULL_SPAN
+    return _Span(_active, name, path, nbytes)
+
+
+class capture:
+    """
+    Perfil separado durante o bloco (lotes em subprocessos ou no próprio processo);
+    o resultado volta ao perfil principal com Profiler.merge(capturado.export()).
+    Classe em vez de @contextmanager: importar contextlib pesava na partida da CLI
+    """
+
+    def __enter__(self):
+        global _active
+        self.previous, _active = _active, Profiler()
+        return _active
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self.previous
+        return False
+
+
+def _human_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}" if unit != "B" else f"{value} B"
+        value /= 1024
+
+
+def print_summary(summary, label):
+    print(f"\n⏱️  Perfil: {label} — {summary['elapsed_ms']:.1f} ms")
+    print(f"   📁 {summary['files']} arquivo(s) ({summary['files_per_sec']:.0f}/s) | "
+          f"💾 {_human_bytes(summary['bytes'])} ({_human_bytes(summary['bytes_per_sec'])}/s)")
+    for row in summary["spans"]:
+        name = "  " * row["depth"] + row["span"].rsplit("/", 1)[-1]
+        print(f"   {name:<28} {row['calls']:>7}x {row['total_ms']:>10.1f} ms (próprio {row['self_ms']:.1f} ms)")
+    if summary["slowest_files"]:
+        print("   🐢 Arquivos mais lentos:")
+        for row in summary["slowest_files"]:
+            print(f"      {row['ms']:>9.2f} ms  {row['path']}")
+
+
+def profile_run(label, project_root=None, enabled=True, cprofile=False, top=TOP_FILES):
+    """
+    Ativa o perfil durante o bloco; ao final imprime o resumo e grava
+    <raiz>/.desenrola/profiles/<label>-<data>.json (e .prof com cProfile)
+    """
+    from contextlib import contextmanager
+    return contextmanager(_profile_run)(label, project_root, enabled, cprofile, top)
+
+
+def _profile_run(label, project_root, enabled, cprofile, top):
+    global _active
+    if not enabled or _active is not None:
+        yield _active
+        return
+
+    profiler = Profiler()
+    c_profile = None
+    if cprofile:
+        import cProfile
+        c_profile = cProfile.Profile()
+
+    _active = profiler
+    if c_profile:
+        c_profile.enable()
+    try:
+        with span(label):
+            yield profiler
+    finally:
+        if c_profile:
+            c_profile.disable()
+        _active = None
+        profiler.stop()
+
+        summary = profiler.summary(top)
+        print_summary(summary, label)
+        if project_root is not None:
+            _save(profiler, summary, label, project_root, c_profile)
+
+
+def _save(profiler, summary, label, project_root, c_profile):
+    import json
+    from datetime import datetime
+    from integrity_scan import state_dir
+
+    try:
+        directory = state_dir(project_root) / "profiles"
+        directory.mkdir(exist_ok=True)
+    except OSError as e:
+        print(f"   ⚠️  Perfil não gravado: {e}")
+        return
+    stem = f"{label.replace(' ', '_').replace('/', '_')}-{datetime.now():%Y%m%d-%H%M%S}"
+    with open(directory / f"{stem}.json", 'w', encoding='utf-8') as f:
+        json.dump(dict(summary, label=label), f, ensure_ascii=False, indent=2)
+    print(f"   💾 {directory / (stem + '.json')}")
+
+    if c_profile is not None:
+        import pstats
+        c_profile.dump_stats(str(directory / f"{stem}.prof"))
+        print(f"   💾 {directory / (stem + '.prof')} (cProfile)")
+        pstats.Stats(c_profile).sort_stats("cumulative").print_stats(15)
+
+
+def profiled(name=None):
+    """
+    Decorador de métodos: abre um span com o nome da operação.
+    Se a instância tiver `profile=True` e nenhum perfil estiver ativo, a chamada vira uma execução perfilada
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _active is None and getattr(self, "profile", False):
+                with profile_run(label, getattr(self, "project_root", None),
+                                 cprofile=getattr(self, "cprofile", False)):
+                    return func(self, *args, **kwargs)
+            with span(label):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profile_flags(argv):
+    """(profile, cprofile) a partir de --profile / --cprofile na linha de comando"""
+    cprofile = "--cprofile" in argv
+    return "--profile" in argv or cprofile, cprofile
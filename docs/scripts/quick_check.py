@@ -4,9 +4,11 @@ Execução direta das funções do file_manager
 """
 
 import os
-import shutil
 from pathlib import Path
-from datetime import datetime
+
+from backup_store import BackupStore
+from golden import GLOBAL_HEADER, get_registry
+from matcher import compile_matcher
 
 def verify_and_recreate_header():
     """Função para verificar e recriar o GlobalHeader.tsx"""
@@ -15,7 +17,7 @@ def verify_and_recreate_header():
     backup_dir = project_root / "backups"
     backup_dir.mkdir(exist_ok=True)
     
-    file_path = project_root / "components" / "layout" / "GlobalHeader.tsx"
+    file_path = project_root / GLOBAL_HEADER
     
     print("🚀 Desenrola DCL - Verificação Automática")
     print("=" * 50)
@@ -24,41 +26,35 @@ def verify_and_recreate_header():
     if file_path.exists():
         print(f"✅ Arquivo encontrado: {file_path}")
         
-        # Criar backup
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"GlobalHeader_{timestamp}.tsx.backup"
-        backup_path = backup_dir / backup_name
-        shutil.copy2(file_path, backup_path)
-        print(f"📦 Backup criado: {backup_path}")
+        # Criar backup (deduplicado: só copia se o conteúdo mudou)
+        backup_path, created = BackupStore(backup_dir, project_root).backup(file_path)
+        if created:
+            print(f"📦 Backup criado: {backup_path}")
+        else:
+            print(f"♻️  Backup já existente: {backup_path}")
         
-        # Ler conteúdo atual
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Verificações básicas (trechos obrigatórios do registro golden/)
+        checks = get_registry().checks(GLOBAL_HEADER)
         
-        # Verificações básicas
-        checks = [
-            ("'use client'", "Diretiva client-side"),
-            ("export function GlobalHeader", "Exportação do componente"),
-            ("import { useState }", "Imports React"),
-            ("from 'lucide-react'", "Imports de ícones"),
-            ("const NAVIGATION_ITEMS", "Constantes de navegação"),
-            ("bg-white/80 backdrop-blur-lg", "Estilo glassmorphism")
-        ]
+        # Verificações e contagens numa única passada pelo conteúdo
+        # (arquivos grandes são lidos em blocos, com memória constante)
+        result = compile_matcher([check for check, _ in checks] + ['const ', 'import ']).scan_file(file_path)
+        found = result["counts"]
         
         print("\n🔍 Verificando integridade:")
         all_good = True
         for check, description in checks:
-            if check in content:
+            if found[check]:
                 print(f"✅ {description}: OK")
             else:
                 print(f"❌ {description}: FALTANDO")
                 all_good = False
         
         print(f"\n📊 Estatísticas do arquivo:")
-        print(f"   📄 Linhas: {len(content.splitlines())}")
-        print(f"   💾 Tamanho: {len(content)} caracteres")
-        print(f"   🎯 Componentes: {content.count('const ')}")
-        print(f"   📦 Imports: {content.count('import ')}")
+        print(f"   📄 Linhas: {result['lines']}")
+        print(f"   💾 Tamanho: {result['chars']} caracteres")
+        print(f"   🎯 Componentes: {found['const ']}")
+        print(f"   📦 Imports: {found['import ']}")
         
         if all_good:
             print("\n🎉 GlobalHeader.tsx está perfeito!")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Geração em lote de componentes e páginas a partir de um spec JSON
+Tudo é gravado numa única transação: qualquer falha desfaz o lote inteiro
+
+Exemplo de spec:
+{
+  "components": [{"name": "PedidoCard", "path": "src/components/pedidos/PedidoCard.tsx"}],
+  "pages": [{"name": "Relatorios"}]
+}
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+
+from atomic_io import encode_text, same_content
+from template_engine import get_template
+
+TMP_SUFFIX = ".scaffold-tmp"
+BAK_SUFFIX = ".scaffold-bak"
+
+
+class ScaffoldError(Exception):
+    pass
+
+
+def default_path(kind, name):
+    """Caminho padrão: src/components/<Nome>.tsx ou src/app/<nome>/page.tsx"""
+    if kind == "pages":
+        return f"src/app/{name.lower()}/page.tsx"
+    return f"src/components/{name}.tsx"
+
+
+def plan(project_root, spec, templates_dir=None, overwrite=False):
+    """
+    Renderiza tudo em memória e valida antes de tocar no disco.
+    Retorna [(destino, bytes)]; arquivos idênticos ao que já existe são omitidos
+    """
+    if not isinstance(spec, dict):
+        raise ScaffoldError("o spec precisa ser um objeto JSON")
+    project_root = Path(project_root)
+    root = project_root.resolve()
+    items, seen, errors = [], set(), []
+
+    for kind, default_type in (("components", "functional"), ("pages", "page")):
+        entries = spec.get(kind, [])
+        if not isinstance(entries, list):
+            errors.append(f"{kind}: esperava uma lista")
+            continue
+        for index, item in enumerate(entries):
+            name = item.get("name") if isinstance(item, dict) else None
+            if not isinstance(name, str) or not name.strip():
+                errors.append(f"{kind}[{index}]: falta \"name\" (texto não vazio)")
+                continue
+            rel = item.get("path", default_path(kind, name))
+            if not isinstance(rel, str) or not rel.strip():
+                errors.append(f"{kind}[{index}] ({name}): \"path\" inválido")
+                continue
+            if not isinstance(item.get("vars", {}), dict):
+                errors.append(f"{kind}[{index}] ({name}): \"vars\" precisa ser um objeto")
+                continue
+            target = project_root / rel
+            # Nome ou caminho com ../ (ou absoluto) não pode gravar fora do projeto
+            if not target.resolve().is_relative_to(root):
+                errors.append(f"fora do projeto: {target}")
+                continue
+            if target in seen:
+                errors.append(f"destino repetido: {target}")
+                continue
+            seen.add(target)
+
+            template = get_template(item.get("type", default_type), templates_dir)
+            data = encode_text(template.render(component_name=name, **item.get("vars", {})))
+            if target.is_dir():
+                errors.append(f"destino é um diretório: {target}")
+                continue
+            if target.exists():
+                if same_content(target, data):
+                    continue
+                if not overwrite:
+                    errors.append(f"já existe: {target}")
+                    continue
+            items.append((target, data))
+
+    if errors:
+        raise ScaffoldError("; ".join(errors))
+    return items
+
+
+def _make_parents(directory, created):
+    """mkdir -p registrando os diretórios criados (para desfazer)"""
+    missing = []
+    while not directory.exists():
+        missing.append(directory)
+        directory = directory.parent
+    for path in reversed(missing):
+        path.mkdir()
+        created.append(path)
+
+
+def apply(items, backup=None, durable=False):
+    """
+    Grava o lote: 1) temporários ao lado dos destinos, 2) renomeia todos,
+    3) descarta as cópias antigas. Em caso de erro, desfaz na ordem inversa
+    """
+    created_dirs, temps, renamed = [], [], []
+    try:
+        for target, data in items:
+            _make_parents(target.parent, created_dirs)
+            tmp_path = target.with_name(target.name + TMP_SUFFIX)
+            with open(tmp_path, 'wb') as f:
+                temps.append(tmp_path)   # o arquivo já existe: se a escrita falhar, também é removido
+                f.write(data)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        for target, _ in items:
+            bak_path = None
+            if target.exists():
+                if backup:
+                    backup(target)
+                bak_path = target.with_name(target.name + BAK_SUFFIX)
+                os.replace(target, bak_path)
+            renamed.append((target, bak_path))
+            os.replace(target.with_name(target.name + TMP_SUFFIX), target)
+    except BaseException:
+        for target, bak_path in reversed(renamed):
+            if bak_path is not None and bak_path.exists():
+                os.replace(bak_path, target)
+            elif bak_path is None and target.exists():
+                target.unlink()
+        for tmp_path in temps:
+            tmp_path.unlink(missing_ok=True)
+        for directory in reversed(created_dirs):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        raise
+
+    # Lote confirmado: as cópias antigas já não são necessárias
+    for _, bak_path in renamed:
+        if bak_path is not None:
+            try:
+                bak_path.unlink()
+            except OSError:
+                pass
+    return [target for target, _ in items]
+
+
+def scaffold(project_root, spec, templates_dir=None, overwrite=False, backup=None, durable=False):
+    """Planeja e grava o lote; devolve a lista de arquivos escritos"""
+    return apply(plan(project_root, spec, templates_dir, overwrite), backup, durable)
+
+
+def run_scaffold(project_root, spec_path, templates_dir=None, overwrite=False, backup=None):
+    """Lê o spec, gera os arquivos e imprime o resumo (None se nada foi gravado por erro)"""
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    started = time.perf_counter()
+    try:
+        written = scaffold(project_root, spec, templates_dir, overwrite, backup)
+    except ScaffoldError as e:
+        print(f"❌ Spec inválido, nada foi gravado: {e}")
+        return None
+    except OSError as e:
+        print(f"❌ Falha ao gravar, lote desfeito: {e}")
+        return None
+
+    total = len(spec.get("components", [])) + len(spec.get("pages", []))
+    print(f"✅ {len(written)} arquivo(s) gravados ({total - len(written)} já estavam idênticos)")
+    print(f"⏱️  Tempo: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return written
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Uso: python scaffold.py <raiz_do_projeto> <spec.json> [--overwrite]")
+        sys.exit(1)
+    run_scaffold(sys.argv[1], sys.argv[2], overwrite="--overwrite" in sys.argv)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Reparo por trechos: em vez de recriar o arquivo inteiro a partir do template,
+compara o arquivo atual com a versão canônica e reaplica só os trechos (hunks)
+que contêm o que as verificações não encontraram. As demais edições locais ficam.
+O custo depois do diff é proporcional aos trechos alterados, não ao tamanho do arquivo
+"""
+
+from atomic_io import encode_text
+from line_diff import diff_lines
+
+
+def _newline(data):
+    """Quebra de linha que o arquivo já usa (para não transformar cada linha numa diferença)"""
+    return "\r\n" if b"\r\n" in data else "\n"
+
+
+def repair(current, canonical, checks):
+    """
+    current: bytes do arquivo; canonical: texto (ou bytes) da versão canônica;
+    checks: [(trecho obrigatório, descrição)].
+    Retorna {content, patched, kept, failed} ou None se os trechos do canônico não bastam
+    (aí só recriar o arquivo inteiro resolve)
+    """
+    failed = [(needle, description) for needle, description in checks if needle.encode('utf-8') not in current]
+    if not failed:
+        return {"content": current, "patched": [], "kept": 0, "failed": []}
+
+    if isinstance(canonical, str):
+        canonical = encode_text(canonical, newline=_newline(current))
+    a = current.splitlines(keepends=True)
+    b = canonical.splitlines(keepends=True)
+    opcodes = diff_lines(a, b)
+    changes = [op for op in opcodes if op[0] != "equal"]
+
+    # Primeiro trecho do canônico que contém cada verificação que falhou
+    selected = {}
+    for needle, description in failed:
+        raw = needle.encode('utf-8')
+        for index, (_, _, _, j1, j2) in enumerate(changes):
+            if raw in b"".join(b[j1:j2]):
+                selected.setdefault(index, []).append(description)
+                break
+        else:
+            return None
+
+    out, patched, index = [], [], 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            out.extend(a[i1:i2])
+            continue
+        if index in selected:
+            out.extend(b[j1:j2])
+            patched.append({"checks": selected[index], "line": i1 + 1,
+                            "removed": i2 - i1, "added": j2 - j1})
+        else:
+            out.extend(a[i1:i2])
+        index += 1
+
+    content = b"".join(out)
+    # Um trecho reaplicado pode ter levado junto algo que outra verificação exigia
+    if any(needle.encode('utf-8') not in content for needle, _ in checks):
+        return None
+    return {"content": content, "patched": patched, "kept": len(changes) - len(patched),
+            "failed": [description for _, description in failed]}
+
+
+def print_repair(report, file_path):
+    for hunk in report["patched"]:
+        lines = f"linha {hunk['line']}" + (f"-{hunk['line'] + hunk['removed'] - 1}" if hunk["removed"] > 1 else "")
+        print(f"🩹 {lines}: +{hunk['added']} -{hunk['removed']} ({', '.join(hunk['checks'])})")
+    kept = f", {report['kept']} edição(ões) local(is) mantida(s)" if report["kept"] else ""
+    print(f"✅ {file_path}: {len(report['patched'])} trecho(s) reaplicado(s){kept}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Snapshots de pastas inteiras (ex.: src/) e restauração de qualquer subconjunto
+Cada snapshot é um JSON em backups/snapshots/ com o hash de cada arquivo; o conteúdo fica
+nos mesmos blobs dos backups, então arquivos inalterados não ocupam nada de novo.
+A restauração só regrava os arquivos cujo conteúdo difere do snapshot
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+from backup_store import BackupStore, hash_file
+from atomic_io import atomic_write_bytes
+from integrity_scan import write_json_atomic
+from profiling import span
+
+SAFETY_LABEL = "antes-do-restore"
+
+
+def _selected(rel, prefixes):
+    """Arquivo dentro de algum dos caminhos pedidos (sem caminhos = todos)"""
+    return not prefixes or any(rel == prefix or rel.startswith(prefix + "/") for prefix in prefixes)
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class Snapshots:
+    def __init__(self, project_root):
+        self.project_root = Path(project_root).absolute()
+        self.store = BackupStore(self.project_root / "backups", self.project_root)
+        self.directory = self.store.snapshots_dir
+
+    def _new_id(self, now):
+        snapshot_id = now.strftime("%Y%m%d-%H%M%S")
+        suffix = 1
+        while (self.directory / f"{snapshot_id}.json").exists():
+            suffix += 1
+            snapshot_id = f"{now:%Y%m%d-%H%M%S}-{suffix}"
+        return snapshot_id
+
+    def list(self, root=None):
+        return self.store.catalog.snapshots(root)
+
+    def resolve_id(self, text):
+        """Id completo a partir de um prefixo único (ou 'ultimo' para o mais recente)"""
+        if text in ("ultimo", "latest"):
+            latest = self.list()
+            return latest[0]["id"] if latest else None
+        ids = sorted(path.stem for path in self.directory.glob("*.json")) if self.directory.is_dir() else []
+        if text in ids:
+            return text
+        matches = [snapshot_id for snapshot_id in ids if snapshot_id.startswith(text)]
+        return matches[0] if len(matches) == 1 else None
+
+    def load(self, snapshot_id):
+        with open(self.directory / f"{snapshot_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def create(self, root="src", label=None):
+        """
+        Captura a pasta inteira. Hashes vêm do manifesto da pasta (stat inalterado = nada é lido)
+        e só conteúdos ainda sem blob são gravados
+        """
+        started = time.perf_counter()
+        root, scan = self.store.scan_tree(root)
+        if not scan["files"]:
+            raise SnapshotError(f"{root}: nenhum arquivo")
+
+        catalog = self.store.catalog
+        known = catalog.known_blobs()
+        previous = next(iter(catalog.snapshots(root)), None)
+        previous_files = self.load(previous["id"])["files"] if previous else {}
+
+        files, stored = {}, {}
+        for rel, record in sorted(scan["files"].items()):
+            sha256 = record["sha256"]
+            if sha256 not in known and sha256 not in stored:
+                path = self.project_root / rel
+                before = os.stat(path)
+                if (before.st_mtime_ns, before.st_size) != (record["mtime_ns"], record["size"]):
+                    sha256 = hash_file(path)   # mudou depois da varredura
+                base = previous_files.get(rel, [None])[0]
+                sha256, method = self.store.put_blob(path, sha256, before, base)
+                stored_size, base = self.store.blob_info(sha256)
+                stored[sha256] = (stored_size, base, method)
+            files[rel] = [sha256, self.store.raw_size(sha256) if sha256 in stored else record["size"]]
+
+        now = datetime.now()
+        snapshot = {
+            "id": self._new_id(now),
+            "root": root,
+            "timestamp": now.isoformat(timespec='milliseconds'),   # ordena snapshots do mesmo segundo
+            "files": files,
+        }
+        if label:
+            snapshot["label"] = label
+
+        # O JSON é a fonte da verdade (o catálogo pode ser recriado a partir dele)
+        with span("write"):
+            self.directory.mkdir(exist_ok=True)
+            write_json_atomic(self.directory / f"{snapshot['id']}.json", snapshot)
+            catalog.add_snapshot(snapshot, stored)
+
+        return {"id": snapshot["id"], "root": root, "files": len(files), "new_blobs": len(stored),
+                "rehashed": scan["rehashed"], "elapsed": time.perf_counter() - started}
+
+    def restore(self, snapshot_id, paths=(), delete_extra=False, dry_run=False):
+        """
+        Traz de volta os arquivos do snapshot (todos ou os que estão sob `paths`).
+        Arquivos iguais ao snapshot não são tocados; antes de sobrescrever algo, um snapshot
+        de segurança da situação atual é criado. delete_extra remove arquivos que não existiam
+        """
+        started = time.perf_counter()
+        snapshot = self.load(snapshot_id)
+        prefixes = [str(path).replace(os.sep, '/').strip("/") for path in paths]
+        selected = {rel: sha256 for rel, (sha256, _) in snapshot["files"].items() if _selected(rel, prefixes)}
+        if prefixes and not selected:
+            raise SnapshotError(f"nenhum arquivo do snapshot {snapshot_id} em {', '.join(prefixes)}")
+
+        _, scan = self.store.scan_tree(snapshot["root"])
+        current = scan["files"]
+        changed = sorted(rel for rel, sha256 in selected.items() if current.get(rel, {}).get("sha256") != sha256)
+        extra = sorted(rel for rel in current if rel not in snapshot["files"] and _selected(rel, prefixes)) \
+            if delete_extra else []
+
+        result = {"id": snapshot_id, "selected": len(selected), "restored": changed, "deleted": extra,
+                  "safety": None}
+        if dry_run or not (changed or extra):
+            result["elapsed"] = time.perf_counter() - started
+            return result
+
+        # Sobrescrever sem volta não: a situação atual vira um snapshot antes
+        result["safety"] = self.create(snapshot["root"], SAFETY_LABEL)["id"]
+        for rel in changed:
+            sha256 = selected[rel]
+            with span("read", rel) as s:
+                data = self.store.read_blob(sha256)
+                s.nbytes = len(data)
+            if hashlib.sha256(data).hexdigest() != sha256:
+                raise SnapshotError(f"blob {sha256} de {rel} corrompido")
+            atomic_write_bytes(self.project_root / rel, data)
+        for rel in extra:
+            os.unlink(self.project_root / rel)
+
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def delete(self, snapshot_id):
+        """Apaga o snapshot e os blobs que só ele usava"""
+        orphans = self.store.catalog.remove_snapshot(snapshot_id)
+        for sha256, _ in orphans:
+            self.store.delete_blob(sha256)
+        (self.directory / f"{snapshot_id}.json").unlink(missing_ok=True)
+        return orphans
+
+
+def print_snapshots(rows):
+    if not rows:
+        print("📸 Nenhum snapshot")
+        return
+    print(f"📸 {len(rows)} snapshot(s):")
+    for row in rows:
+        when = datetime.fromtimestamp(row["created_at"]).strftime("%d/%m/%Y %H:%M:%S")
+        label = f" [{row['label']}]" if row["label"] else ""
+        print(f"   {row['id']:<18} {row['root']:<12} {row['files']:>6} arquivo(s)  📅 {when}{label}")
+
+
+def print_restore(result, dry_run=False):
+    prefix = "🔎 (simulação) " if dry_run else ""
+    if result["safety"]:
+        print(f"🛟 Situação anterior salva no snapshot {result['safety']}")
+    for rel in result["restored"]:
+        print(f"{prefix}♻️  {rel}")
+    for rel in result["deleted"]:
+        print(f"{prefix}🗑️  {rel}")
+    unchanged = result["selected"] - len(result["restored"])
+    print(f"{prefix}✅ Snapshot {result['id']}: {len(result['restored'])} arquivo(s) restaurado(s), "
+          f"{unchanged} já iguais, {len(result['deleted'])} removido(s) "
+          f"em {result['elapsed'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    snapshots = Snapshots(args[0] if args else "D:/projetos/desenrola_dcl")
+    if "--list" in sys.argv:
+        print_snapshots(snapshots.list())
+    else:
+        info = snapshots.create(args[1] if len(args) > 1 else "src")
+        print(f"📸 Snapshot {info['id']}: {info['files']} arquivo(s), {info['new_blobs']} blob(s) novo(s) "
+              f"em {info['elapsed'] * 1000:.1f} ms")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Índice dos scripts de database/: qual arquivo cria, altera ou remove cada objeto
+(tabelas, views, funções, triggers, políticas, índices...)
+Persistido em .desenrola/sql_index.sqlite; só os arquivos alterados são analisados de novo
+"""
+
+import os
+import re
+import time
+import bisect
+import sqlite3
+from pathlib import Path
+
+from integrity_scan import state_dir, iter_files
+from profiling import span
+
+SQL_ROOTS = ("database",)
+INDEX_NAME = "sql_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS objects (
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    action TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    target TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_objects_name ON objects (name);
+CREATE INDEX IF NOT EXISTS idx_objects_target ON objects (target);
+CREATE INDEX IF NOT EXISTS idx_objects_path ON objects (path);
+"""
+
+# Comentários, strings e corpos $tag$...$tag$ não contêm limites de comando
+_TOKENS = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\$(?P<tag>[A-Za-z_]\w*|)\$.*?\$(?P=tag)\$|;", re.S)
+
+_IDENT = r'(?:"[^"]+"|[\w$]+)(?:\s*\.\s*(?:"[^"]+"|[\w$]+))*'
+_DDL = re.compile(rf"""
+    (?P<action>create(?:\s+or\s+replace)?|alter|drop|comment\s+on)\s+
+    (?:(?:temp|temporary|unlogged|materialized|unique|constraint|global|local|recursive)\s+)*
+    (?P<type>table|view|function|procedure|trigger|index|policy|type|sequence|schema|extension|
+             column|rule|domain|aggregate)\s+
+    (?:concurrently\s+)?(?:if\s+(?:not\s+)?exists\s+)?(?:only\s+)?
+    (?P<name>{_IDENT})
+""", re.I | re.X)
+_GRANT = re.compile(rf"""
+    (?P<action>grant|revoke)\s+.*?\s+on\s+
+    (?:(?P<type>table|view|function|sequence|schema)\s+)?
+    (?P<name>{_IDENT})
+""", re.I | re.X | re.S)
+_ON_TARGET = re.compile(rf"\s+on\s+(?:table\s+)?(?:only\s+)?(?P<target>{_IDENT})", re.I)
+_DO_BLOCK = re.compile(r"do\s*\$(?P<tag>[A-Za-z_]\w*|)\$(?P<body>.*)\$(?P=tag)\$", re.I | re.S)
+# Dentro de DO $$ ... $$ o comando pode vir depois de BEGIN / THEN / ELSE / LOOP
+_BLOCK_DDL = re.compile(r"(?:^|\b(?:begin|then|else|loop)\s+)(?=(?:create|alter|drop|comment\s+on|grant|revoke)\b)",
+                        re.I)
+_IDENT_PART = re.compile(r'"([^"]+)"|([\w$]+)')
+
+# Objetos que pertencem a uma tabela (a busca pela tabela também os encontra)
+_ON_TYPES = {"trigger", "index", "policy", "rule"}
+
+
+def normalize(identifier):
+    """Nome canônico: sem aspas, minúsculo quando não citado, sem o esquema public"""
+    parts = [quoted if quoted else bare.lower() for quoted, bare in _IDENT_PART.findall(identifier)]
+    if len(parts) > 1 and parts[0] == "public":
+        parts = parts[1:]
+    return ".".join(parts)
+
+
+def iter_statements(text):
+    """(offset, comando) de cada comando do script, sem comentários; corpos $$ ficam no texto"""
+    start, pieces = None, []
+    position = 0
+    for match in _TOKENS.finditer(text):
+        chunk = text[position:match.start()]
+        if start is None and chunk.strip():
+            start = position + len(chunk) - len(chunk.lstrip())
+        pieces.append(chunk)
+        token = match.group(0)
+        position = match.end()
+        if token == ";":
+            if start is not None:
+                yield start, "".join(pieces)
+            start, pieces = None, []
+        elif token.startswith("--") or token.startswith("/*"):
+            pieces.append(" ")
+        else:
+            if start is None:
+                start = match.start()
+            pieces.append(token)
+    tail = text[position:]
+    if start is not None or tail.strip():
+        if start is None:
+            start = position + len(tail) - len(tail.lstrip())
+        yield start, "".join(pieces) + tail
+
+
+def parse_sql(text, base_offset=0, in_block=False):
+    """
+    Objetos tocados por cada comando: [(nome, tipo, ação, offset, alvo)].
+    Blocos DO $$ ... $$ são analisados recursivamente
+    """
+    found = []
+    for offset, statement in iter_statements(text):
+        head = statement.lstrip()
+        do_block = _DO_BLOCK.match(head)
+        if do_block:
+            body_offset = offset + do_block.start("body")
+            found.extend(parse_sql(do_block.group("body"), base_offset + body_offset, in_block=True))
+            continue
+        if in_block:
+            block_start = _BLOCK_DDL.search(head)
+            if not block_start:
+                continue
+            head = head[block_start.end():]
+            offset += block_start.end()
+
+        match = _DDL.match(head) or _GRANT.match(head)
+        if not match:
+            continue
+        action = " ".join(match.group("action").lower().split())
+        if action == "create or replace":
+            action = "create"
+        obj_type = (match.group("type") or "table").lower()
+        name = normalize(match.group("name"))
+        target = None
+
+        if obj_type in _ON_TYPES:
+            if name == "on":   # CREATE INDEX ON tabela (...) sem nome
+                on = re.match(rf"(?P<target>{_IDENT})", head[match.end():].lstrip())
+                name = target = normalize(on.group("target")) if on else None
+            else:
+                on = _ON_TARGET.search(head, match.end())
+                target = normalize(on.group("target")) if on else None
+        elif obj_type == "column":
+            # COMMENT ON COLUMN tabela.coluna: o objeto é a tabela
+            table, _, _ = name.rpartition(".")
+            obj_type, target = "column", table or None
+        if name and name != "all":   # GRANT ... ON ALL TABLES IN SCHEMA
+            found.append((name, obj_type, action, base_offset + offset, target))
+    return found
+
+
+def line_index(text):
+    """Offsets de início de cada linha (para converter offset -> número da linha)"""
+    return [0] + [match.end() for match in re.finditer("\n", text)]
+
+
+class SqlIndex:
+    def __init__(self, project_root, roots=SQL_ROOTS):
+        self.project_root = Path(project_root).absolute()
+        self.roots = tuple(roots)
+        self.conn = sqlite3.connect(state_dir(self.project_root) / INDEX_NAME)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _index_file(self, rel, full_path):
+        with span("read", rel) as s:
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            s.nbytes = len(data)
+        with span("parse", rel):
+            text = data.decode('utf-8', errors='replace')
+            lines = line_index(text)
+            rows = [(name, obj_type, action, rel, bisect.bisect_right(lines, offset), target)
+                    for name, obj_type, action, offset, target in parse_sql(text)]
+        self.conn.execute("DELETE FROM objects WHERE path = ?", (rel,))
+        self.conn.executemany(
+            "INSERT INTO objects (name, type, action, path, line, target) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def update(self):
+        """Reanalisa só os scripts novos/alterados (mtime_ns, tamanho) e remove os apagados"""
+        started = time.perf_counter()
+        known = {row["path"]: (row["mtime_ns"], row["size"]) for row in self.conn.execute("SELECT * FROM files")}
+        seen = set()
+        result = {"parsed": 0, "removed": 0, "objects": 0}
+        prefix = len(str(self.project_root)) + 1
+
+        with self.conn:
+            for root in self.roots:
+                base_dir = self.project_root / root
+                if not base_dir.is_dir():
+                    continue
+                for entry, st in iter_files(base_dir, {".sql"}):
+                    rel = entry.path[prefix:].replace(os.sep, '/')
+                    seen.add(rel)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if known.get(rel) == stamp:
+                        continue
+                    result["objects"] += self._index_file(rel, entry.path)
+                    result["parsed"] += 1
+                    self.conn.execute("INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                                      (rel, *stamp))
+
+            for rel in set(known) - seen:
+                self.conn.execute("DELETE FROM objects WHERE path = ?", (rel,))
+                self.conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                result["removed"] += 1
+
+        result["files"] = len(seen)
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def lookup(self, name, obj_type=None, like=False):
+        """
+        Ocorrências de um objeto (ou dos objetos ligados a uma tabela: triggers, índices, políticas).
+        like=True aceita curingas * e ?
+        """
+        if like:
+            pattern = normalize_pattern(name)
+            clause, params = "(name LIKE ? ESCAPE '\\' OR target LIKE ? ESCAPE '\\')", [pattern, pattern]
+        else:
+            key = normalize(name)
+            clause, params = "(name = ? OR target = ?)", [key, key]
+        if obj_type:
+            clause += " AND type = ?"
+            params.append(obj_type.lower())
+        return [dict(row) for row in self.conn.execute(
+            f"SELECT name, type, action, path, line, target FROM objects WHERE {clause} "
+            "ORDER BY name, path, line", params)]
+
+    def defined_in(self, path):
+        """Objetos tocados por um script"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT name, type, action, line, target FROM objects WHERE path = ? ORDER BY line", (path,))]
+
+    def stats(self):
+        row = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT name), COUNT(DISTINCT path) FROM objects").fetchone()
+        return {"entries": row[0], "objects": row[1], "files": row[2]}
+
+
+def normalize_pattern(pattern):
+    """Curingas de shell (* e ?) para LIKE, escapando % e _"""
+    pattern = normalize(pattern) if not any(c in pattern for c in "*?") else pattern.lower()
+    pattern = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return pattern.replace("*", "%").replace("?", "_")
+
+
+def print_lookup(rows, name):
+    if not rows:
+        print(f"🔎 Nenhum script toca {name}")
+        return
+    print(f"🔎 {name}: {len(rows)} ocorrência(s)")
+    current = None
+    for row in rows:
+        if row["name"] != current:
+            current = row["name"]
+            print(f"\n   🗄️  {current}")
+        suffix = f" (em {row['target']})" if row["target"] and row["target"] != row["name"] else ""
+        print(f"      {row['action']:<10} {row['type']:<9} {row['path']}:{row['line']}{suffix}")
+
+
+def run_lookup(project_root, name, obj_type=None, like=False):
+    """Atualiza o índice (incremental) e imprime onde o objeto é criado, alterado ou removido"""
+    index = SqlIndex(project_root)
+    try:
+        update = index.update()
+        started = time.perf_counter()
+        rows = index.lookup(name, obj_type, like)
+        elapsed = time.perf_counter() - started
+        print_lookup(rows, name)
+        print(f"\n⏱️  Índice: {update['parsed']} script(s) reanalisado(s) de {update['files']} "
+              f"em {update['elapsed'] * 1000:.1f} ms | busca: {elapsed * 1000:.2f} ms")
+        return rows
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python sql_index.py [raiz_do_projeto] <objeto> [--like]")
+        sys.exit(1)
+    root, name = (args[0], args[1]) if len(args) > 1 else ("D:/projetos/desenrola_dcl", args[0])
+    run_lookup(root, name, like="--like" in sys.argv)
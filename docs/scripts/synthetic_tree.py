@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Gerador de árvores sintéticas no formato do projeto (Next.js + database/ + docs/)
+Determinístico: a mesma semente gera exatamente os mesmos arquivos
+"""
+
+import json
+import random
+from pathlib import Path
+
+# Proporção de cada tipo de arquivo (como no projeto real: ~45% tsx, ~30% sql, ~25% md)
+MIX = (("tsx", 0.45), ("sql", 0.30), ("md", 0.25))
+FILES_PER_DIR = 40
+BROKEN_RATIO = 0.01   # arquivos com marcador de conflito (para a verificação ter o que achar)
+
+WORDS = ["pedido", "cliente", "loja", "lente", "armacao", "estoque", "fornecedor", "laboratorio",
+         "montador", "servico", "pagamento", "entrega", "kanban", "relatorio", "dashboard", "usuario"]
+CLASSES = ["p-4", "px-6", "py-2", "flex", "items-center", "gap-2", "text-sm", "font-bold", "rounded-lg",
+           "shadow", "bg-white", "text-gray-600", "hover:bg-gray-50", "border", "grid", "grid-cols-2"]
+
+
+def _name(rng, parts=2):
+    return "".join(rng.choice(WORDS).capitalize() for _ in range(parts))
+
+
+def make_component(rng, name):
+    lines = ["'use client'", "", "import { useState } from 'react'", "import { cn } from '@/lib/utils'"]
+    for _ in range(rng.randint(0, 4)):
+        other = _name(rng)
+        lines.append(f"import {{ {other} }} from '@/components/{rng.choice(WORDS)}/{other}'")
+    lines += ["", f"interface {name}Props {{", "  className?: string", "}", "",
+              f"export function {name}({{ className }}: {name}Props) {{",
+              "  const [aberto, setAberto] = useState(false)", "", "  return (",
+              f'    <div className={{cn("{" ".join(rng.sample(CLASSES, 4))}", className)}}>']
+    for i in range(rng.randint(3, 40)):
+        lines.append(f'      <p className="{" ".join(rng.sample(CLASSES, 3))}">{rng.choice(WORDS)} {i}</p>')
+    lines += ["    </div>", "  )", "}", ""]
+    return "\n".join(lines)
+
+
+def make_page(rng, name):
+    return "\n".join([
+        "import { Metadata } from 'next'", "",
+        f"export const metadata: Metadata = {{ title: '{name}' }}", "",
+        f"export default function {name}Page() {{",
+        f'  return <div className="container mx-auto p-6">{name}</div>',
+        "}", ""])
+
+
+def make_sql(rng, name):
+    table = name.lower()
+    lines = [f"-- Migração {name}", f"CREATE TABLE IF NOT EXISTS {table} ("]
+    columns = ["  id uuid PRIMARY KEY DEFAULT gen_random_uuid()"]
+    for word in rng.sample(WORDS, rng.randint(2, 8)):
+        columns.append(f"  {word}_id uuid REFERENCES {word}s(id)")
+    lines.append(",\n".join(columns))
+    lines.append(");")
+    lines.append(f"CREATE INDEX IF NOT EXISTS idx_{table}_id ON {table}(id);")
+    lines.append(f"CREATE OR REPLACE VIEW vw_{table} AS SELECT * FROM {table};")
+    for i in range(rng.randint(0, 30)):
+        lines.append(f"INSERT INTO {table} (id) VALUES (gen_random_uuid()); -- {i}")
+    return "\n".join(lines) + "\n"
+
+
+def make_md(rng, name):
+    lines = [f"# {name}", ""]
+    for section in range(rng.randint(1, 6)):
+        lines += [f"## {rng.choice(WORDS).capitalize()} {section}", ""]
+        for _ in range(rng.randint(2, 12)):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))) + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def plan_tree(n_files, seed=42):
+    """Lista determinística de (caminho_relativo, conteúdo)"""
+    rng = random.Random(seed)
+    files = []
+    for kind, share in MIX:
+        count = round(n_files * share) if kind != MIX[-1][0] else n_files - len(files)
+        for i in range(count):
+            directory = f"d{i // FILES_PER_DIR:04d}"
+            name = f"{_name(rng)}{i}"
+            if kind == "tsx":
+                if i % 5 == 0:
+                    rel, content = f"src/app/{directory}/{name.lower()}/page.tsx", make_page(rng, name)
+                else:
+                    rel, content = f"src/components/{directory}/{name}.tsx", make_component(rng, name)
+            elif kind == "sql":
+                rel, content = f"database/migrations/{directory}/{i:06d}_{name.lower()}.sql", make_sql(rng, name)
+            else:
+                rel, content = f"docs/{directory}/{name.upper()}.md", make_md(rng, name)
+            if rng.random() < BROKEN_RATIO:
+                content = "<<<<<<< HEAD\n" + content
+            files.append((rel, content))
+    return files
+
+
+def generate(project_root, n_files, seed=42):
+    """Grava a árvore (idempotente: pula se já existe uma árvore com os mesmos parâmetros)"""
+    project_root = Path(project_root)
+    marker = project_root / ".synthetic.json"
+    params = {"files": n_files, "seed": seed}
+    if marker.exists():
+        saved = json.loads(marker.read_text(encoding='utf-8'))
+        if all(saved.get(key) == value for key, value in params.items()):
+            return project_root
+
+    total_bytes = 0
+    created_dirs = set()
+    for rel, content in plan_tree(n_files, seed):
+        path = project_root / rel
+        if path.parent not in created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(path.parent)
+        data = content.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    header = project_root / "components" / "layout" / "GlobalHeader.tsx"
+    header.parent.mkdir(parents=True, exist_ok=True)
+    header.write_text(make_component(random.Random(seed), "GlobalHeader"), encoding='utf-8')
+
+    marker.write_text(json.dumps(dict(params, bytes=total_bytes)), encoding='utf-8')
+    return project_root
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Uso: python synthetic_tree.py <destino> <n_arquivos> [semente]")
+        sys.exit(1)
+    root = generate(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 42)
+    print(f"✅ Árvore sintética em {root}")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Índice das classes Tailwind usadas em src/: cada className="..." / className={...} e cada
+argumento de cn(...) é quebrado em classes, e o índice classe -> (arquivo, ocorrências)
+fica em .desenrola/tailwind_index.sqlite. Só arquivos com sha256 diferente do indexado
+são relidos, então reindexar depois de uma edição custa um arquivo.
+Relatório: classes mais usadas, classes usadas uma única vez e strings longas de classes
+quase iguais (candidatas a virar componente)
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+from bisect import bisect_right
+from collections import Counter, defaultdict
+
+from integrity_scan import ManifestScanner, state_dir
+from profiling import span
+
+SRC_ROOTS = ("src",)
+CODE_EXTENSIONS = (".tsx", ".jsx", ".ts", ".js")
+INDEX_NAME = "tailwind_index.sqlite"
+CLASS_CALLS = ("cn",)   # src/lib/utils.ts: cn(...) = twMerge(clsx(...))
+LONG_STRING_TOKENS = 6
+DEFAULT_THRESHOLD = 0.8
+TOP_CLASSES = 30
+MAX_LISTED = 40
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    class TEXT NOT NULL,
+    path TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS classes_class ON classes (class);
+CREATE INDEX IF NOT EXISTS classes_path ON classes (path);
+CREATE TABLE IF NOT EXISTS strings (
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    classes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS strings_path ON strings (path);
+"""
+
+_SITE = re.compile(r"\bclassName\s*=\s*|\b(?:%s)\(" % "|".join(CLASS_CALLS))
+_COMPARISON = ("===", "!==", "==", "!=")
+# Classes começam com minúscula, dígito, '[' (valor arbitrário), '!' ou '-' (negativas)
+_CLASS = re.compile(r"[!\-]?[a-z0-9\[@*][^\s'\"`{}]*")
+
+
+def _string_end(text, i, quote):
+    """Posição da aspa que fecha a string iniciada em i (ou None se a linha acabar antes)"""
+    j = i + 1
+    while j < len(text) and text[j] != quote:
+        if text[j] == "\\":
+            j += 1
+        elif text[j] == "\n":
+            return None
+        j += 1
+    return j if j < len(text) else None
+
+
+def _literals(text, i, closer):
+    """
+    Strings de uma expressão JSX/TS a partir de i até o `closer` do mesmo nível.
+    Devolve ([(texto, posição, colado_à_esquerda, colado_à_direita)], fim).
+    Partes estáticas de template strings colam em ${...} ('text-${cor}-500' não gera classes);
+    strings comparadas (status === 'ativo') não são classes
+    """
+    literals, depth = [], 0
+    while i < len(text):
+        ch = text[i]
+        if ch in "'\"":
+            j = _string_end(text, i, ch)
+            if j is None:
+                return literals, i
+            before, after = text[max(i - 8, 0):i].rstrip(), text[j + 1:j + 9].lstrip()
+            if not before.endswith(_COMPARISON) and not after.startswith(_COMPARISON):
+                literals.append((text[i + 1:j], i + 1, False, False))
+            i = j + 1
+            continue
+        if ch == "`":
+            j = start = i + 1
+            glued = False
+            while j < len(text) and text[j] != "`":
+                if text[j] == "\\":
+                    j += 2
+                elif text.startswith("${", j):
+                    literals.append((text[start:j], start, glued, True))
+                    inner, j = _literals(text, j + 2, "}")
+                    literals.extend(inner)
+                    start, glued = j, True
+                else:
+                    j += 1
+            literals.append((text[start:j], start, glued, False))
+            i = j + 1
+            continue
+        if ch in "({[":
+            depth += 1
+        elif ch in ")}]":
+            if depth == 0:
+                return literals, i + 1
+            depth -= 1
+        i += 1
+    return literals, i
+
+
+def _classes(literal, glued_left, glued_right):
+    words = literal.split()
+    if words and glued_left and not literal[:1].isspace():
+        words = words[1:]
+    if words and glued_right and not literal[-1:].isspace():
+        words = words[:-1]
+    return [word for word in words if _CLASS.fullmatch(word)]
+
+
+def extract(text):
+    """(Counter de classes, [(linha, classes)] das strings com LONG_STRING_TOKENS classes ou mais)"""
+    newlines = [m.start() for m in re.finditer("\n", text)]
+    counts, strings = Counter(), []
+    covered = 0   # className={cn(...)}: o cn de dentro já foi lido
+    for match in _SITE.finditer(text):
+        if match.start() < covered:
+            continue
+        i = match.end()
+        if match.group().startswith("className"):
+            if i < len(text) and text[i] in "'\"":
+                j = _string_end(text, i, text[i])
+                if j is None:
+                    continue
+                literals, covered = [(text[i + 1:j], i + 1, False, False)], j + 1
+            elif i < len(text) and text[i] == "{":
+                literals, covered = _literals(text, i + 1, "}")
+            else:
+                continue
+        else:
+            literals, covered = _literals(text, i, ")")
+
+        for literal, position, glued_left, glued_right in literals:
+            classes = _classes(literal, glued_left, glued_right)
+            counts.update(classes)
+            if len(classes) >= LONG_STRING_TOKENS:
+                strings.append((bisect_right(newlines, position) + 1, " ".join(classes)))
+    return counts, strings
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def similar_groups(items, threshold=DEFAULT_THRESHOLD):
+    """
+    Grupos de conjuntos de classes com Jaccard >= threshold. Filtro de prefixo: com as classes
+    ordenadas da mais rara para a mais comum, dois conjuntos parecidos o bastante sempre
+    compartilham uma das primeiras len - ceil(threshold * len) + 1 classes, então só esses
+    pares são comparados
+    """
+    from math import ceil
+    from near_duplicates import DisjointSet
+
+    frequency = Counter(cls for classes in items for cls in classes)
+    candidates = defaultdict(list)
+    groups, scores = DisjointSet(), {}
+    for index, classes in enumerate(items):
+        ordered = sorted(classes, key=lambda cls: (frequency[cls], cls))
+        prefix = ordered[:len(ordered) - ceil(threshold * len(ordered)) + 1]
+        seen = set()
+        for cls in prefix:
+            for other in candidates[cls]:
+                if other in seen:
+                    continue
+                seen.add(other)
+                shorter, longer = sorted((len(items[other]), len(classes)))
+                if shorter < threshold * longer:   # nem com tudo em comum chegaria ao limite
+                    continue
+                score = jaccard(items[other], classes)
+                if score >= threshold:
+                    scores[(other, index)] = score
+                    groups.union(other, index)
+            candidates[cls].append(index)
+
+    members, lowest = defaultdict(set), {}
+    for (a, b), score in scores.items():
+        root = groups.find(a)
+        members[root].update((a, b))
+        lowest[root] = min(score, lowest.get(root, score))
+    return [(sorted(group), lowest[root]) for root, group in members.items()]
+
+
+class TailwindIndex:
+    def __init__(self, project_root, roots=SRC_ROOTS):
+        self.project_root = os.path.abspath(project_root)
+        self.roots = tuple(roots)
+        self.conn = sqlite3.connect(state_dir(self.project_root) / INDEX_NAME)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _index_file(self, rel, sha256):
+        with span("read", rel) as s:
+            with open(os.path.join(self.project_root, rel), 'rb') as f:
+                data = f.read()
+            s.nbytes = len(data)
+        with span("tokenize", rel):
+            counts, strings = extract(data.decode('utf-8', errors='replace'))
+        self._remove_file(rel)
+        self.conn.execute("INSERT INTO files (path, sha256) VALUES (?, ?)", (rel, sha256))
+        self.conn.executemany("INSERT INTO classes (class, path, count) VALUES (?, ?, ?)",
+                              [(cls, rel, count) for cls, count in counts.items()])
+        self.conn.executemany("INSERT INTO strings (path, line, classes) VALUES (?, ?, ?)",
+                              [(rel, line, classes) for line, classes in strings])
+
+    def _remove_file(self, rel):
+        for table in ("classes", "strings", "files"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel,))
+
+    def update(self):
+        """Atualiza o manifesto e reindexa só os arquivos cujo sha256 difere do indexado"""
+        started = time.perf_counter()
+        scan = ManifestScanner(self.project_root, self.roots).scan()
+        code = {rel: record for rel, record in scan["files"].items() if rel.endswith(CODE_EXTENSIONS)}
+        indexed = dict(self.conn.execute("SELECT path, sha256 FROM files"))
+        result = {"indexed": 0, "removed": 0, "files": len(code)}
+
+        with self.conn:
+            for rel, record in code.items():
+                if indexed.get(rel) != record["sha256"]:
+                    self._index_file(rel, record["sha256"])
+                    result["indexed"] += 1
+            for rel in set(indexed) - set(code):
+                self._remove_file(rel)
+                result["removed"] += 1
+
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def lookup(self, cls):
+        """[(arquivo, ocorrências)] de uma classe"""
+        return self.conn.execute("SELECT path, count FROM classes WHERE class = ? ORDER BY count DESC, path",
+                                 (cls,)).fetchall()
+
+    def top(self, limit=TOP_CLASSES):
+        """[(classe, ocorrências, arquivos)]"""
+        return self.conn.execute("SELECT class, SUM(count) AS total, COUNT(*) FROM classes GROUP BY class "
+                                 "ORDER BY total DESC, class LIMIT ?", (limit,)).fetchall()
+
+    def one_offs(self):
+        """[(classe, arquivo)] das classes que aparecem uma única vez em todo o src/"""
+        return self.conn.execute("SELECT class, MIN(path) FROM classes GROUP BY class "
+                                 "HAVING SUM(count) = 1 ORDER BY class").fetchall()
+
+    def similar_strings(self, threshold=DEFAULT_THRESHOLD):
+        """Grupos de strings longas de classes iguais ou quase iguais, dos maiores para os menores"""
+        rows = self.conn.execute("SELECT path, line, classes FROM strings ORDER BY path, line").fetchall()
+        with span("compare"):
+            groups = similar_groups([frozenset(classes.split()) for _, _, classes in rows], threshold)
+        result = []
+        for members, score in groups:
+            result.append({
+                "similarity": round(score, 3),
+                "classes": rows[members[0]][2],
+                "places": [f"{rows[m][0]}:{rows[m][1]}" for m in members],
+            })
+        return sorted(result, key=lambda group: (-len(group["places"]), -group["similarity"], group["classes"]))
+
+    def report(self, top=TOP_CLASSES, threshold=DEFAULT_THRESHOLD):
+        totals = self.conn.execute("SELECT COUNT(DISTINCT class), COALESCE(SUM(count), 0) FROM classes").fetchone()
+        return {
+            "classes": totals[0],
+            "occurrences": totals[1],
+            "top": [{"class": cls, "count": count, "files": files} for cls, count, files in self.top(top)],
+            "one_offs": [{"class": cls, "file": rel} for cls, rel in self.one_offs()],
+            "similar": self.similar_strings(threshold),
+        }
+
+
+def run_tailwind(project_root, top=TOP_CLASSES, threshold=DEFAULT_THRESHOLD, lookup=None, as_json=False):
+    """Atualiza o índice e imprime o relatório (ou os arquivos que usam uma classe)"""
+    index = TailwindIndex(project_root)
+    try:
+        update = index.update()
+        if lookup:
+            rows = index.lookup(lookup)
+            if as_json:
+                print(json.dumps([{"file": rel, "count": count} for rel, count in rows], ensure_ascii=False, indent=2))
+                return rows
+            print(f"🎨 {lookup}: {sum(count for _, count in rows)} ocorrência(s) em {len(rows)} arquivo(s)")
+            for rel, count in rows:
+                print(f"   {count:>4}  {rel}")
+            return rows
+        report = index.report(top, threshold)
+    finally:
+        index.close()
+
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return report
+
+    print(f"🎨 {report['classes']} classe(s) distintas, {report['occurrences']} ocorrência(s) em "
+          f"{update['files']} arquivo(s) | 🔄 Reindexados: {update['indexed']} em {update['elapsed'] * 1000:.1f} ms")
+
+    print(f"\n🔥 Mais usadas:")
+    for item in report["top"]:
+        print(f"   {item['count']:>6}  {item['class']:<32} {item['files']} arquivo(s)")
+
+    one_offs = report["one_offs"]
+    print(f"\n🦄 Usadas uma única vez: {len(one_offs)}")
+    for item in one_offs[:MAX_LISTED]:
+        print(f"   {item['class']:<40} {item['file']}")
+    if len(one_offs) > MAX_LISTED:
+        print(f"   ... e mais {len(one_offs) - MAX_LISTED} (--json lista todas)")
+
+    similar = report["similar"]
+    print(f"\n🧩 Strings longas iguais ou quase iguais (≥ {threshold:.0%}): {len(similar)} grupo(s)")
+    for group in similar[:MAX_LISTED]:
+        print(f"   {len(group['places'])}× ({group['similarity']:.0%}) \"{group['classes']}\"")
+        for place in group["places"]:
+            print(f"      ↪ {place}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    run_tailwind(args[0] if args else "D:/projetos/desenrola_dcl", as_json="--json" in sys.argv)
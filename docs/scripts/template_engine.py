@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Motor de templates de componentes e páginas
+Cada template é compilado uma vez (partes literais + variáveis) e reaproveitado.
+Sintaxe: ${variavel} ou $variavel; use $$ para um '$' literal (ex.: $${...} em template strings)
+"""
+
+from string import Template
+from functools import lru_cache
+from pathlib import Path
+
+BUILTIN_TEMPLATES = {
+    "functional": """'use client'
+
+import { useState } from 'react'
+import { cn } from '@/lib/utils'
+
+interface ${component_name}Props {
+  className?: string
+}
+
+export function ${component_name}({ className }: ${component_name}Props) {
+  const [state, setState] = useState(false)
+
+  return (
+    <div className={cn("p-4", className)}>
+      <h2>Componente ${component_name}</h2>
+    </div>
+  )
+}""",
+
+    "page": """import { Metadata } from 'next'
+
+export const metadata: Metadata = {
+  title: '${component_name}',
+  description: 'Página ${component_name} do sistema Desenrola DCL'
+}
+
+export default function ${component_name}Page() {
+  return (
+    <div className="container mx-auto p-6">
+      <h1 className="text-2xl font-bold mb-6">${component_name}</h1>
+      <div className="bg-white rounded-lg shadow p-6">
+        <p>Conteúdo da página ${component_name}</p>
+      </div>
+    </div>
+  )
+}""",
+}
+
+TEMPLATE_SUFFIX = ".tpl"
+
+
+class CompiledTemplate:
+    def __init__(self, source):
+        self.parts = []      # texto literal ou índice da variável
+        self.variables = []
+        position = 0
+        for match in Template.pattern.finditer(source):
+            self.parts.append(source[position:match.start()])
+            if match.group("escaped") is not None:
+                self.parts.append("$")
+            elif match.group("invalid") is not None:
+                raise ValueError(f"placeholder inválido na posição {match.start()}")
+            else:
+                name = match.group("named") or match.group("braced")
+                if name not in self.variables:
+                    self.variables.append(name)
+                self.parts.append(self.variables.index(name))
+            position = match.end()
+        self.parts.append(source[position:])
+        self.parts = [part for part in self.parts if part != ""]
+
+    def render(self, **values):
+        """Preenche as variáveis (todas são obrigatórias)"""
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise KeyError(f"variáveis sem valor: {', '.join(missing)}")
+        ordered = [str(values[name]) for name in self.variables]
+        return "".join(part if isinstance(part, str) else ordered[part] for part in self.parts)
+
+
+@lru_cache(maxsize=None)
+def compile_template(source):
+    """Compila (uma única vez por texto) um template"""
+    return CompiledTemplate(source)
+
+
+@lru_cache(maxsize=None)
+def _load_override(path, mtime_ns):
+    with open(path, 'r', encoding='utf-8') as f:
+        return compile_template(f.read())
+
+
+def get_template(name, templates_dir=None):
+    """
+    Template compilado pelo nome. Um arquivo <templates_dir>/<nome>.tpl substitui o embutido;
+    tipos desconhecidos usam "functional", como antes
+    """
+    if templates_dir:
+        path = Path(templates_dir) / f"{name}{TEMPLATE_SUFFIX}"
+        try:
+            return _load_override(str(path), path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            pass
+    return compile_template(BUILTIN_TEMPLATES.get(name, BUILTIN_TEMPLATES["functional"]))
+
+
+def render(name, templates_dir=None, **values):
+    """Atalho: busca o template e preenche as variáveis"""
+    return get_template(name, templates_dir).render(**values)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Estatísticas de todos os arquivos de src/ (as mesmas de show_stats) com totais por pasta
+Cada arquivo é medido uma única vez por conteúdo: as métricas ficam em cache pelo sha256
+do manifesto, então uma nova execução só mede o que mudou (o resto é só stat).
+Saída em texto (pastas, histogramas, maiores arquivos), JSON ou CSV
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+from collections import defaultdict
+
+from integrity_scan import ManifestScanner, state_dir, write_json_atomic
+from matcher import compile_matcher
+from profiling import span, active, capture
+
+# Métricas de show_stats (contadas numa única passada pelo matcher)
+STATS_PATTERNS = ['import ', 'const ', 'function ', 'useState', 'className', '<Link', 'Icon']
+COLUMNS = [pattern.strip().lstrip("<") for pattern in STATS_PATTERNS]
+
+SRC_ROOTS = ("src",)
+CODE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".css")
+CACHE_NAME = "stats_cache.json"
+CACHE_VERSION = 1
+BATCHES_PER_WORKER = 4
+DEFAULT_DEPTH = 2   # src/components/kanban, src/app/pedidos...
+TOP_FILES = 15
+
+# Limites (inclusive à esquerda) dos histogramas
+SIZE_BUCKETS = (1024, 4096, 16384, 65536)
+LINE_BUCKETS = (50, 100, 250, 500, 1000)
+
+
+def _measure_batch(batch):
+    """Mede um lote de arquivos; com perfil ativo devolve também os spans do lote"""
+    project_root, rel_paths, profile = batch
+    matcher = compile_matcher(STATS_PATTERNS)
+
+    def measure_all():
+        measured = []
+        for rel in rel_paths:
+            result = matcher.scan_file(os.path.join(project_root, rel))
+            measured.append((rel, [result["lines"], result["chars"]]
+                             + [result["counts"][pattern] for pattern in STATS_PATTERNS]))
+        return measured
+
+    if not profile:
+        return measure_all(), None
+    with capture() as profiler:
+        measured = measure_all()
+    return measured, profiler.export()
+
+
+def histogram(values, bounds):
+    """[(rótulo, quantidade)] com uma faixa antes, entre e depois dos limites"""
+    counts = [0] * (len(bounds) + 1)
+    for value in values:
+        counts[sum(value >= bound for bound in bounds)] += 1
+    labels = [f"< {bounds[0]}"] + [f"{low}–{high - 1}" for low, high in zip(bounds, bounds[1:])] \
+        + [f"≥ {bounds[-1]}"]
+    return list(zip(labels, counts))
+
+
+def _kb(size):
+    return f"{size / 1024:.0f} KB" if size >= 1024 else f"{size} B"
+
+
+class TreeStats:
+    def __init__(self, project_root, roots=SRC_ROOTS):
+        self.project_root = os.path.abspath(project_root)
+        self.roots = tuple(roots)
+        self.cache_path = state_dir(self.project_root) / CACHE_NAME
+        self.files = {}   # caminho -> {"bytes", "lines", "chars", <coluna>: n}
+
+    def _load_cache(self):
+        if self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Padrões diferentes invalidam tudo (as colunas do cache não batem mais)
+            if data.get("version") == CACHE_VERSION and data.get("patterns") == STATS_PATTERNS:
+                return data["entries"]
+        return {}
+
+    def build(self, workers=None):
+        """Atualiza o manifesto e mede só os arquivos com hash fora do cache"""
+        from parallel import default_workers, make_batches, iter_parallel
+
+        started = time.perf_counter()
+        with span("scan"):
+            scan = ManifestScanner(self.project_root, self.roots).scan()
+        code = {rel: record for rel, record in scan["files"].items() if rel.endswith(CODE_EXTENSIONS)}
+        cache = self._load_cache()
+        pending = [(rel, record["size"]) for rel, record in code.items() if record["sha256"] not in cache]
+
+        workers = workers or default_workers()
+        profiler = active()
+        batches = make_batches(pending, workers * BATCHES_PER_WORKER, weight=lambda item: item[1])
+        batches = [(self.project_root, [rel for rel, _ in batch], profiler is not None) for batch in batches]
+        for measured, profile in iter_parallel(_measure_batch, batches, workers):
+            if profile:
+                profiler.merge(profile)
+            for rel, values in measured:
+                cache[code[rel]["sha256"]] = values
+
+        live = {record["sha256"] for record in code.values()}
+        if pending or len(cache) != len(live):
+            write_json_atomic(self.cache_path, {"version": CACHE_VERSION, "patterns": STATS_PATTERNS,
+                                                "entries": {sha: cache[sha] for sha in live}})
+
+        with span("rollup"):
+            for rel, record in code.items():
+                lines, chars, *counts = cache[record["sha256"]]
+                self.files[rel] = dict(zip(COLUMNS, counts), bytes=record["size"], lines=lines, chars=chars)
+        return {"files": len(code), "measured": len(pending), "elapsed": time.perf_counter() - started}
+
+    def directories(self, depth=DEFAULT_DEPTH):
+        """Totais por pasta até `depth` níveis abaixo da raiz (cada arquivo conta em todas as pastas acima)"""
+        totals = defaultdict(lambda: dict.fromkeys(["files", "bytes", "lines"] + COLUMNS, 0))
+        for rel, metrics in self.files.items():
+            parts = rel.split("/")
+            root_parts = 1 if parts[0] in self.roots else 0
+            for level in range(root_parts, min(len(parts) - 1, root_parts + depth) + 1):
+                row = totals["/".join(parts[:level]) or "."]
+                row["files"] += 1
+                for column in ["bytes", "lines"] + COLUMNS:
+                    row[column] += metrics[column]
+        return dict(sorted(totals.items()))
+
+    def top(self, n=TOP_FILES, key="bytes"):
+        return sorted(self.files.items(), key=lambda item: (-item[1][key], item[0]))[:n]
+
+    def report(self, top=TOP_FILES, depth=DEFAULT_DEPTH):
+        return {
+            "files": len(self.files),
+            "directories": self.directories(depth),
+            "histograms": {
+                "bytes": histogram([m["bytes"] for m in self.files.values()], SIZE_BUCKETS),
+                "lines": histogram([m["lines"] for m in self.files.values()], LINE_BUCKETS),
+            },
+            "top": [dict(metrics, path=rel) for rel, metrics in self.top(top)],
+        }
+
+    def write_csv(self, out, per_file=False, depth=DEFAULT_DEPTH):
+        """Uma linha por pasta (ou por arquivo, com per_file=True)"""
+        writer = csv.writer(out, lineterminator="\n")
+        if per_file:
+            writer.writerow(["path", "bytes", "lines"] + COLUMNS)
+            for rel, metrics in sorted(self.files.items()):
+                writer.writerow([rel, metrics["bytes"], metrics["lines"]] + [metrics[c] for c in COLUMNS])
+            return
+        writer.writerow(["directory", "files", "bytes", "lines"] + COLUMNS)
+        for directory, row in self.directories(depth).items():
+            writer.writerow([directory] + [row[c] for c in ["files", "bytes", "lines"] + COLUMNS])
+
+
+def run_tree_stats(project_root, top=TOP_FILES, depth=DEFAULT_DEPTH, output="text", per_file=False, workers=None):
+    """Mede src/ e imprime totais por pasta, histogramas e os maiores arquivos (ou JSON/CSV)"""
+    stats = TreeStats(project_root)
+    build = stats.build(workers)
+
+    if output == "csv":
+        stats.write_csv(sys.stdout, per_file, depth)
+        return stats
+    report = stats.report(top, depth)
+    if output == "json":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return stats
+
+    print(f"📁 {report['files']} arquivo(s) em {', '.join(stats.roots)}/ | "
+          f"🔄 Medidos: {build['measured']} em {build['elapsed'] * 1000:.1f} ms")
+    print(f"\n{'pasta':<36} {'arqs':>5} {'tamanho':>8} {'linhas':>7} " + " ".join(f"{c:>9}" for c in COLUMNS))
+    for directory, row in report["directories"].items():
+        indent = "  " * directory.count("/")
+        print(f"{indent + directory:<36} {row['files']:>5} {_kb(row['bytes']):>8} {row['lines']:>7} "
+              + " ".join(f"{row[c]:>9}" for c in COLUMNS))
+
+    for name, title in (("bytes", "💾 Tamanho (bytes)"), ("lines", "📄 Linhas")):
+        print(f"\n{title}:")
+        buckets = report["histograms"][name]
+        widest = max(count for _, count in buckets) or 1
+        for label, count in buckets:
+            print(f"   {label:>12} {count:>5} {'█' * round(count * 40 / widest)}")
+
+    print(f"\n🏋️  Maiores arquivos:")
+    for item in report["top"]:
+        print(f"   {_kb(item['bytes']):>7} {item['lines']:>6} linhas  {item['path']}")
+    return stats
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    output = "json" if "--json" in sys.argv else "csv" if "--csv" in sys.argv else "text"
+    run_tree_stats(args[0] if args else "D:/projetos/desenrola_dcl", output=output)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Verificação de integridade de todo o projeto a partir de um manifesto de regras
+Cada regra associa um glob (ex.: src/components/**/*.tsx) a padrões obrigatórios e proibidos
+"""
+
+import os
+import re
+import json
+import time
+
+from matcher import compile_matcher
+from profiling import active, capture, span
+
+# pathlib, integrity_scan e parallel são importados só na verificação completa:
+# checar um único arquivo (hook de pre-commit) precisa partir rápido
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "verify_rules.json")
+DEFAULT_ROOTS = ("src", "database", "docs")
+BATCHES_PER_WORKER = 4
+
+# Regras compiladas no processo atual (preenchidas por _init_worker)
+_RULES = None
+
+
+def glob_to_regex(glob):
+    """Traduz um glob com **, *, ? e {a,b} para regex sobre caminhos com '/'"""
+    i, out = 0, []
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "{":
+            end = glob.index("}", i)
+            options = glob[i + 1:end].split(",")
+            out.append("(?:" + "|".join(re.escape(o) for o in options) + ")")
+            i = end + 1
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def load_rules(rules_path=DEFAULT_RULES):
+    """Carrega o manifesto de regras"""
+    with open(rules_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["rules"]
+
+
+def compile_rules(rules):
+    """Compila os globs das regras"""
+    return [(glob_to_regex(rule["glob"]), rule) for rule in rules]
+
+
+def rules_for(rel_path, compiled):
+    """Regras cujo glob casa com o caminho relativo"""
+    return [rule for regex, rule in compiled if regex.match(rel_path)]
+
+
+def rule_patterns(rules):
+    """Todos os padrões (obrigatórios e proibidos) de um conjunto de regras"""
+    return [check["pattern"] for rule in rules
+            for check in rule.get("required", []) + rule.get("forbidden", [])]
+
+
+def evaluate(found, rules):
+    """Converte as contagens do matcher em itens faltando/proibidos"""
+    missing, forbidden = [], []
+    for rule in rules:
+        for check in rule.get("required", []):
+            if not found[check["pattern"]]:
+                missing.append(check["description"])
+        for check in rule.get("forbidden", []):
+            if found[check["pattern"]]:
+                forbidden.append(check["description"])
+    return missing, forbidden
+
+
+def check_text(content, rules):
+    """Aplica padrões obrigatórios e proibidos ao conteúdo numa única passada"""
+    found = compile_matcher(rule_patterns(rules)).counts(content)
+    return evaluate(found, rules)
+
+
+def check_file(project_root, rel_path, rules, stream=None):
+    """Verifica um arquivo contra as regras aplicáveis (arquivos grandes em blocos)"""
+    with span("verify", rel_path):
+        result = compile_matcher(rule_patterns(rules)).scan_file(os.path.join(project_root, rel_path), stream=stream)
+    missing, forbidden = evaluate(result["counts"], rules)
+    return {
+        "path": rel_path,
+        "ok": not missing and not forbidden,
+        "missing": missing,
+        "forbidden": forbidden,
+        "size": result["chars"],
+    }
+
+
+def _init_worker(rules):
+    global _RULES
+    _RULES = compile_rules(rules)
+
+
+def _check_batch(batch):
+    """Verifica um lote; com perfil ativo no processo principal, devolve também os spans do lote"""
+    project_root, rel_paths, profile = batch
+    if not profile:
+        return [check_file(project_root, rel, rules_for(rel, _RULES)) for rel in rel_paths], None
+    with capture() as profiler:
+        results = [check_file(project_root, rel, rules_for(rel, _RULES)) for rel in rel_paths]
+    return results, profiler.export()
+
+
+def collect_files(project_root, compiled, roots=DEFAULT_ROOTS):
+    """Lista (caminho_relativo, tamanho) dos arquivos cobertos por alguma regra"""
+    from pathlib import Path
+    from integrity_scan import iter_files
+
+    project_root = Path(project_root).absolute()
+    prefix = len(str(project_root)) + 1
+    files = []
+    for root in roots:
+        base_dir = project_root / root
+        if not base_dir.is_dir():
+            continue
+        for entry, st in iter_files(base_dir):
+            rel = entry.path[prefix:].replace(os.sep, '/')
+            if rules_for(rel, compiled):
+                files.append((rel, st.st_size))
+    return files
+
+
+def verify_all(project_root, roots=DEFAULT_ROOTS, rules=None, workers=None):
+    """
+    Verifica a árvore inteira em paralelo.
+    Gerador: devolve o resultado de cada arquivo assim que o lote dele termina
+    """
+    from parallel import default_workers, make_batches, iter_parallel
+
+    rules = rules if rules is not None else load_rules()
+    workers = workers or default_workers()
+    profiler = active()
+    with span("collect"):
+        files = collect_files(project_root, compile_rules(rules), roots)
+
+    batches = make_batches(files, workers * BATCHES_PER_WORKER, weight=lambda item: item[1])
+    batches = [(str(project_root), [rel for rel, _ in batch], profiler is not None) for batch in batches]
+
+    for results, profile in iter_parallel(_check_batch, batches, workers, _init_worker, (rules,)):
+        if profile:
+            profiler.merge(profile)
+        yield from results
+
+
+def run_verify_all(project_root, roots=DEFAULT_ROOTS, workers=None):
+    """Executa a verificação completa e imprime o relatório"""
+    from parallel import default_workers
+
+    started = time.perf_counter()
+    total, failures = 0, []
+    for result in verify_all(project_root, roots, workers=workers):
+        total += 1
+        if not result["ok"]:
+            failures.append(result)
+
+    print(f"📁 Arquivos verificados: {total}")
+    for result in sorted(failures, key=lambda r: r["path"]):
+        print(f"❌ {result['path']}")
+        for description in result["missing"]:
+            print(f"   FALTANDO: {description}")
+        for description in result["forbidden"]:
+            print(f"   PROIBIDO: {description}")
+    if not failures:
+        print("✅ Todas as regras foram atendidas")
+
+    print(f"⏱️  Tempo: {(time.perf_counter() - started) * 1000:.1f} ms ({workers or default_workers()} processo(s))")
+    return not failures
+
+
+if __name__ == "__main__":
+    import sys
+    root = sys.argv[1] if len(sys.argv) > 1 else "D:/projetos/desenrola_dcl"
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    sys.exit(0 if run_verify_all(root, workers=n_workers) else 1)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Modo observação: verifica e faz backup só dos arquivos que mudaram
+Usa inotify (Linux, via ctypes) e cai para varredura periódica com os.scandir nos demais sistemas.
+Rajadas de gravações do editor são agrupadas (debounce) e processadas num único lote
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+from pathlib import Path
+
+from integrity_scan import IGNORED_DIRS, TEXT_EXTENSIONS, iter_files
+from verify_rules import load_rules, compile_rules, rules_for, check_file
+from backup_store import BackupStore
+
+DEBOUNCE = 0.3        # silêncio necessário para fechar um lote (s)
+MAX_DELAY = 2.0       # nenhum lote espera mais que isso, mesmo com gravações contínuas (s)
+POLL_INTERVAL = 1.0   # intervalo da varredura no modo sem inotify (s)
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK if hasattr(os, "O_NONBLOCK") else 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")   # wd, mask, cookie, len
+READ_SIZE = 64 * 1024
+
+
+def is_relevant(path):
+    """Ignora temporários de editores e das próprias ferramentas (.tmp, .swp, ~, ocultos)"""
+    name = os.path.basename(path)
+    return not name.startswith(".") and os.path.splitext(name)[1] in TEXT_EXTENSIONS
+
+
+def _load_libc():
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except (ImportError, OSError):
+        return None, None
+    if not hasattr(libc, "inotify_init1"):
+        return None, None
+    return ctypes, libc
+
+
+class InotifyWatcher:
+    """Observa as raízes com inotify; o processo fica bloqueado no select entre eventos"""
+
+    def __init__(self, paths):
+        self._ctypes, self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify indisponível")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._ctypes.get_errno(), "inotify_init1 falhou")
+        self.paths = [str(p) for p in paths]
+        self.dirs = {}   # wd -> diretório
+        for path in self.paths:
+            self._add_tree(path, set())
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = directory
+
+    def _add_tree(self, directory, changed):
+        """Observa um diretório e seus subdiretórios; arquivos já presentes entram no lote"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            self._add_watch(current)
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRS:
+                                stack.append(entry.path)
+                        elif is_relevant(entry.path):
+                            changed.add(entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    def _rescan(self):
+        """Fila do kernel estourou: recomeça as observações e devolve tudo"""
+        for wd in list(self.dirs):
+            self._libc.inotify_rm_watch(self.fd, wd)
+        self.dirs.clear()
+        changed = set()
+        for path in self.paths:
+            self._add_tree(path, changed)
+        return changed
+
+    def wait(self, timeout=None):
+        """Bloqueia até haver eventos (ou o timeout); devolve os caminhos alterados"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, pos)
+                pos += EVENT_HEADER.size
+                name = os.fsdecode(data[pos:pos + length].rstrip(b"\0"))
+                pos += length
+
+                if mask & IN_Q_OVERFLOW:
+                    return self._rescan()
+                if mask & (IN_IGNORED | IN_DELETE_SELF):
+                    self.dirs.pop(wd, None)
+                    continue
+                directory = self.dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                        self._add_tree(path, changed)
+                elif is_relevant(path):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Alternativa portátil: compara (mtime_ns, tamanho) de cada arquivo a cada intervalo"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = [str(p) for p in paths]
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in self.paths:
+            for entry, st in iter_files(path, TEXT_EXTENSIONS):
+                if is_relevant(entry.path):
+                    snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Varre a cada intervalo até achar mudanças (ou o timeout); devolve os caminhos alterados"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+            current = self._snapshot()
+            changed = {path for path, stamp in current.items() if self.snapshot.get(path) != stamp}
+            changed.update(set(self.snapshot) - set(current))
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(paths, polling=False):
+    """inotify quando disponível, senão varredura periódica"""
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except OSError:
+            pass
+    return PollingWatcher(paths)
+
+
+def iter_batches(watcher, debounce=DEBOUNCE, max_delay=MAX_DELAY):
+    """
+    Agrupa eventos em lotes: um lote fecha após `debounce` segundos sem eventos
+    ou `max_delay` segundos depois do primeiro evento
+    """
+    while True:
+        changed = watcher.wait(None)
+        if not changed:
+            continue
+        deadline = time.monotonic() + max_delay
+        while True:
+            remaining = min(debounce, deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            more = watcher.wait(remaining)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+class ChangeProcessor:
+    """Verifica (regras aplicáveis) e faz backup de cada arquivo alterado"""
+
+    def __init__(self, project_root, rules=None, backup=True):
+        self.project_root = Path(project_root).absolute()
+        self.compiled = compile_rules(rules if rules is not None else load_rules())
+        self.store = BackupStore(self.project_root / "backups", self.project_root) if backup else None
+        self._prefix = len(str(self.project_root)) + 1
+
+    def process(self, paths):
+        """Processa um lote; devolve um resultado por arquivo"""
+        results = []
+        for path in sorted(paths):
+            rel = path[self._prefix:].replace(os.sep, '/')
+            result = {"path": rel, "removed": False, "ok": True, "missing": [], "forbidden": [], "backup": False}
+            if not os.path.isfile(path):
+                result["removed"] = True
+                results.append(result)
+                continue
+            try:
+                rules = rules_for(rel, self.compiled)
+                if rules:
+                    result.update(check_file(self.project_root, rel, rules))
+                if self.store is not None:
+                    _, result["backup"] = self.store.backup(path)
+            except FileNotFoundError:
+                result["removed"] = True   # apagado entre o evento e o processamento
+            results.append(result)
+        return results
+
+
+def print_batch(results, elapsed):
+    print(f"\n🔄 {len(results)} arquivo(s) alterado(s) — {elapsed * 1000:.1f} ms")
+    for result in results:
+        if result["removed"]:
+            print(f"   🗑️  {result['path']}")
+            continue
+        suffix = " (📦 backup)" if result["backup"] else ""
+        print(f"   {'✅' if result['ok'] else '❌'} {result['path']}{suffix}")
+        for description in result["missing"]:
+            print(f"      FALTANDO: {description}")
+        for description in result["forbidden"]:
+            print(f"      PROIBIDO: {description}")
+
+
+def watch(project_root, roots=("src",), debounce=DEBOUNCE, max_delay=MAX_DELAY, polling=False, backup=True):
+    """Loop principal do modo observação (Ctrl+C para sair)"""
+    project_root = Path(project_root).absolute()
+    paths = [project_root / root for root in roots if (project_root / root).is_dir()]
+    if not paths:
+        print(f"❌ Nenhuma pasta para observar em {project_root}: {', '.join(roots)}")
+        return
+
+    processor = ChangeProcessor(project_root, backup=backup)
+    watcher = make_watcher(paths, polling)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"varredura a cada {watcher.interval:g}s"
+    print(f"👀 Observando {', '.join(str(p) for p in paths)} ({mode})")
+    print("   Ctrl+C para sair")
+
+    try:
+        for changed in iter_batches(watcher, debounce, max_delay):
+            started = time.perf_counter()
+            results = processor.process(changed)
+            print_batch(results, time.perf_counter() - started)
+    except KeyboardInterrupt:
+        print("\n👋 Modo observação encerrado")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    import sys
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    watch(args[0] if args else "D:/projetos/desenrola_dcl", polling="--poll" in sys.argv)